@@ -1,6 +1,11 @@
+import functools
+import os
 import numpy as np
 import soundfile as sf
+import scipy.fft
 import scipy.signal
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
 
 
@@ -43,6 +48,126 @@ class ModulationType(Enum):
     GAUSSIAN = "gaussian"     # Gaussian pulse shape
 
 
+# Longest time axis, in seconds of audio, kept in _time_axis's cache; longer
+# axes would pin hundreds of megabytes, so they are rebuilt per call
+_TIME_AXIS_CACHE_SECONDS = 1.0
+
+
+def _build_time_axis(sample_rate, num_samples):
+    """Build a read-only sample-time array for a buffer length."""
+    t = np.arange(num_samples, dtype=np.float64) / sample_rate
+    t.flags.writeable = False
+    return t
+
+
+_cached_time_axis = functools.lru_cache(maxsize=16)(_build_time_axis)
+
+
+def _time_axis(sample_rate, num_samples):
+    """Return the read-only sample-time array for a buffer length.
+
+    Carrier and modulation generation both need the same time axis, so short
+    axes are built once per (sample_rate, num_samples) and reused across
+    calls; axes longer than _TIME_AXIS_CACHE_SECONDS are built per call.
+    """
+    if num_samples <= sample_rate * _TIME_AXIS_CACHE_SECONDS:
+        return _cached_time_axis(sample_rate, num_samples)
+    return _build_time_axis(sample_rate, num_samples)
+
+
+def _cycle_position(frequency, t):
+    """Return frequency*t wrapped to [0, 1), the position within each cycle."""
+    cycles = frequency * t
+    cycles -= np.floor(cycles)
+    return cycles
+
+
+def _wrapped_phase(frequency, t):
+    """Return the phase 2*pi*frequency*t wrapped to [0, 2*pi) as float32.
+
+    Whole cycles are removed in float64 before narrowing, so long buffers keep
+    their phase accuracy while the trig and envelope math runs in float32.
+    """
+    phase = _cycle_position(frequency, t).astype(np.float32)
+    phase *= np.float32(2 * np.pi)
+    return phase
+
+
+# Block length and rows per pass used by sine_wave's rotation scheme
+_SINE_BLOCK = 4096
+_SINE_ROWS_PER_PASS = 256
+
+
+def sine_wave(frequency, sample_rate, num_samples, out):
+    """Fill ``out`` with sin(2*pi*frequency*n/sample_rate) without per-sample sin calls.
+
+    One block of sin/cos offsets is computed once; every block is then the
+    rotation sin(a + b) = sin(a)cos(b) + cos(a)sin(b) of that table by the
+    block's exact start phase. Start phases are computed independently, so no
+    error accumulates across the buffer.
+    """
+    full_blocks, tail = divmod(num_samples, _SINE_BLOCK)
+    num_blocks = full_blocks + (1 if tail else 0)
+    
+    block_cycles = (frequency / sample_rate) * np.arange(_SINE_BLOCK)
+    block_cycles -= np.floor(block_cycles)
+    block_angle = 2 * np.pi * block_cycles
+    sin_b = np.sin(block_angle).astype(np.float32)
+    cos_b = np.cos(block_angle).astype(np.float32)
+    
+    start_cycles = (frequency * _SINE_BLOCK / sample_rate) * np.arange(num_blocks)
+    start_cycles -= np.floor(start_cycles)
+    start_angle = 2 * np.pi * start_cycles
+    sin_a = np.sin(start_angle).astype(np.float32)[:, None]
+    cos_a = np.cos(start_angle).astype(np.float32)[:, None]
+    
+    body = out[:full_blocks * _SINE_BLOCK].reshape(full_blocks, _SINE_BLOCK)
+    for row in range(0, full_blocks, _SINE_ROWS_PER_PASS):
+        rows = slice(row, min(row + _SINE_ROWS_PER_PASS, full_blocks))
+        np.multiply(sin_a[rows], cos_b, out=body[rows])
+        body[rows] += cos_a[rows] * sin_b
+    if tail:
+        out[full_blocks * _SINE_BLOCK:] = sin_a[-1] * cos_b[:tail] + cos_a[-1] * sin_b[:tail]
+    return out
+
+
+# Samples per block when fusing carrier * modulation * volume
+_COMBINE_BLOCK = 1 << 16
+
+# Buffers at least this long (about 95 s at 44.1 kHz) are combined in
+# parallel; shorter ones are not worth the hand-off, and segments rendered by
+# generate_from_preset are already spread over its own pool
+_PARALLEL_COMBINE_MIN = 1 << 22
+
+# One shared pool for envelope combining; threads start on first use
+_COMBINE_EXECUTOR = ThreadPoolExecutor(max_workers=os.cpu_count() or 1,
+                                       thread_name_prefix="isochronic-envelope")
+
+
+def _apply_envelope(carrier, modulation, scale):
+    """Return carrier * modulation * scale as a new float32 array.
+
+    Both multiplies run block by block so the second pass hits cache, and
+    buffers of at least _PARALLEL_COMBINE_MIN samples are split across the
+    shared _COMBINE_EXECUTOR (NumPy releases the GIL in ufuncs).
+    """
+    output = np.empty(len(carrier), dtype=np.float32)
+    scale = np.float32(scale)
+    
+    def combine(start):
+        block = slice(start, start + _COMBINE_BLOCK)
+        np.multiply(carrier[block], modulation[block], out=output[block])
+        output[block] *= scale
+    
+    starts = range(0, len(output), _COMBINE_BLOCK)
+    if len(output) >= _PARALLEL_COMBINE_MIN:
+        list(_COMBINE_EXECUTOR.map(combine, starts))
+    else:
+        for start in starts:
+            combine(start)
+    return output
+
+
 # Add the missing generate_isochronic_tone function
 def generate_isochronic_tone(frequency, duration, sample_rate=44100, volume=0.5, carrier_frequency=100.0):
     """Generate a simple isochronic tone with the specified parameters.
@@ -98,8 +223,12 @@ class IsochronicToneGenerator:
     4. Adjusting the volume to the specified level
     
     Features caching for improved performance when generating repeated segments.
+    Finished segments, carriers and modulation envelopes are each cached
+    separately, keeping the CACHE_SIZE most recently used entries of each.
     """
     
+    CACHE_SIZE = 32
+    
     def __init__(self, sample_rate=44100):
         """Initialize the IsochronicToneGenerator.
         
@@ -107,10 +236,14 @@ class IsochronicToneGenerator:
             sample_rate (int, optional): The sample rate for audio generation. Defaults to 44100.
         """
         self.sample_rate = sample_rate
-        # Initialize cache for generated segments
-        self._cache = {}
+        # Initialize LRU caches for generated segments and their components
+        self._cache = OrderedDict()
+        self._carrier_cache = OrderedDict()
+        self._modulation_cache = OrderedDict()
+        # PCG64 generator for noise carriers
+        self._rng = np.random.default_rng()
     
-    def generate_carrier(self, waveform_type, frequency, duration, amplitude=1.0):
+    def generate_carrier(self, waveform_type, frequency, duration, amplitude=1.0, out=None):
         """Generate carrier wave with specified waveform type.
         
         Creates a continuous waveform of the specified type and frequency to 
@@ -121,42 +254,61 @@ class IsochronicToneGenerator:
             frequency (float): The frequency of the carrier wave in Hz
             duration (float): The duration of the carrier wave in seconds
             amplitude (float, optional): The amplitude of the carrier wave. Defaults to 1.0.
+            out (numpy.ndarray, optional): float32 buffer of the carrier's length to
+                write into instead of allocating a new array.
             
         Returns:
-            numpy.ndarray: The generated carrier wave as a numpy array
+            numpy.ndarray: The generated carrier wave as a numpy array (``out`` if given)
             
         Raises:
             ValueError: If an unsupported waveform type is specified
         """
         # Create time array
         num_samples = int(self.sample_rate * duration)
-        t = np.linspace(0, duration, num_samples, endpoint=False)
+        t = _time_axis(self.sample_rate, num_samples)
         
         # Generate waveform based on type
-        if waveform_type == WaveformType.SINE:
-            return amplitude * np.sin(2 * np.pi * frequency * t)
-            
-        elif waveform_type == WaveformType.SQUARE:
-            return amplitude * scipy.signal.square(2 * np.pi * frequency * t)
+        if waveform_type == WaveformType.SQUARE:
+            high = _cycle_position(frequency, t) < 0.5
+            wave = np.where(high, np.float32(1.0), np.float32(-1.0))
             
         elif waveform_type == WaveformType.TRIANGLE:
-            return amplitude * scipy.signal.sawtooth(2 * np.pi * frequency * t, width=0.5)
+            wave = scipy.signal.sawtooth(_wrapped_phase(frequency, t), width=0.5).astype(np.float32)
             
         elif waveform_type == WaveformType.SAWTOOTH:
-            return amplitude * scipy.signal.sawtooth(2 * np.pi * frequency * t)
+            wave = scipy.signal.sawtooth(_wrapped_phase(frequency, t)).astype(np.float32)
             
         elif waveform_type == WaveformType.NOISE:
             # White noise filtered to emphasize the frequency
-            noise = np.random.normal(0, 1, num_samples)
-            # Apply bandpass filter around the frequency
-            b, a = scipy.signal.butter(4, [max(0.01, (frequency - 20) / (self.sample_rate/2)), 
-                                           min(0.99, (frequency + 20) / (self.sample_rate/2))], 
-                                       btype='band')
-            filtered_noise = scipy.signal.filtfilt(b, a, noise)
-            return amplitude * filtered_noise / np.max(np.abs(filtered_noise))
+            if num_samples == 0:
+                return np.zeros(0, dtype=np.float32) if out is None else out
+            noise = self._rng.standard_normal(num_samples, dtype=np.float32)
+            # Apply bandpass around the frequency by masking the spectrum
+            low = max(0.0, frequency - 20)
+            high = min(self.sample_rate / 2, frequency + 20)
+            spectrum = scipy.fft.rfft(noise, workers=-1)
+            freqs = scipy.fft.rfftfreq(num_samples, 1 / self.sample_rate)
+            spectrum[(freqs < low) | (freqs > high)] = 0
+            wave = scipy.fft.irfft(spectrum, n=num_samples, workers=-1).astype(np.float32)
+            peak = np.max(np.abs(wave))
+            if peak > 0:
+                wave /= peak
+        
+        elif num_samples > _SINE_BLOCK:
+            # Long sine wave (also the default if type is unknown) via block rotation
+            wave = np.empty(num_samples, dtype=np.float32) if out is None else out
+            sine_wave(frequency, self.sample_rate, num_samples, wave)
+            
+        else:
+            # Short sine wave, computed in place
+            phase = _wrapped_phase(frequency, t)
+            wave = np.sin(phase, out=phase if out is None else out)
         
-        # Default to sine wave if type is unknown
-        return amplitude * np.sin(2 * np.pi * frequency * t)
+        # Scale into the freshly generated buffer or the caller's buffer
+        if out is None or wave is out:
+            wave *= np.float32(amplitude)
+            return wave
+        return np.multiply(wave, np.float32(amplitude), out=out)
     
     def generate_modulation(self, mod_type, frequency, duration, duty_cycle=0.5, ramp_percent=10):
         """Generate modulation envelope with specified type.
@@ -176,16 +328,16 @@ class IsochronicToneGenerator:
         """
         # Create time array
         num_samples = int(self.sample_rate * duration)
-        t = np.linspace(0, duration, num_samples, endpoint=False)
+        t = _time_axis(self.sample_rate, num_samples)
         
         # Generate modulation based on type
         if mod_type == ModulationType.SQUARE:
             # Classic on/off isochronic pulsing
-            return 0.5 * (1 + scipy.signal.square(2 * np.pi * frequency * t, duty=duty_cycle))
+            return (_cycle_position(frequency, t) < duty_cycle).astype(np.float32)
             
         elif mod_type == ModulationType.SINE:
             # Sine wave modulation (smoother)
-            return 0.5 * (1 + np.sin(2 * np.pi * frequency * t))
+            return 0.5 * (1 + np.sin(_wrapped_phase(frequency, t)))
             
         elif mod_type == ModulationType.TRAPEZOID:
             # Trapezoidal modulation with adjustable ramp
@@ -193,55 +345,33 @@ class IsochronicToneGenerator:
             period_samples = int(self.sample_rate / frequency)
             ramp_samples = int(period_samples * ramp_percent / 100)
             
-            # Generate modulation for each period
-            envelope = np.zeros(num_samples)
-            
-            # Create a single period
-            for i in range(0, num_samples, period_samples):
-                end_idx = min(i + period_samples, num_samples)
-                period_len = end_idx - i
-                
-                if period_len <= ramp_samples * 2:
-                    # Period too short for trapezoid, use triangle
-                    period = np.concatenate([
-                        np.linspace(0, 1, period_len // 2),
-                        np.linspace(1, 0, period_len - period_len // 2)
-                    ])
-                else:
-                    # Create trapezoid pattern
-                    ramp_up = np.linspace(0, 1, ramp_samples)
-                    hold = np.ones(period_len - 2 * ramp_samples)
-                    ramp_down = np.linspace(1, 0, ramp_samples)
-                    period = np.concatenate([ramp_up, hold, ramp_down])
-                
-                # Add to envelope
-                envelope[i:end_idx] = period[:period_len]
+            # Period too short for trapezoid: ramps meet in the middle (triangle)
+            ramp = min(ramp_samples, (period_samples - 1) / 2)
+            if ramp <= 0:
+                return np.ones(num_samples, dtype=np.float32)
             
+            # A trapezoid is a triangle wave clipped to 1: rise over the first
+            # ramp samples of each period, fall to 0 at its last sample
+            phase = (np.arange(num_samples) % period_samples).astype(np.float32)
+            envelope = np.minimum(phase, (period_samples - 1) - phase) / ramp
+            np.clip(envelope, 0.0, 1.0, out=envelope)
             return envelope
             
         elif mod_type == ModulationType.GAUSSIAN:
             # Gaussian pulse modulation
-            envelope = np.zeros(num_samples)
-            
             # Calculate period in samples
             period_samples = int(self.sample_rate / frequency)
             
-            # Create gaussian pulses at each period
-            for i in range(0, num_samples, period_samples):
-                # Center of gaussian
-                center = i + period_samples // 2
-                
-                # Width of gaussian (adjust for desired duty cycle)
-                sigma = period_samples * duty_cycle / 6  # 6-sigma covers most of the gaussian
-                
-                # Generate gaussian around center
-                for j in range(max(0, i), min(num_samples, i + period_samples)):
-                    envelope[j] = np.exp(-0.5 * ((j - center) / sigma) ** 2)
+            # Width of gaussian (adjust for desired duty cycle)
+            sigma = period_samples * duty_cycle / 6  # 6-sigma covers most of the gaussian
             
-            return envelope
+            # Pulses are disjoint, so each sample only sees the gaussian centred
+            # in its own period: evaluate them all in one vectorized pass
+            offset = (np.arange(num_samples) % period_samples - period_samples // 2).astype(np.float32)
+            return np.exp(-0.5 * (offset / sigma) ** 2)
         
         # Default to square wave modulation
-        return 0.5 * (1 + scipy.signal.square(2 * np.pi * frequency * t))
+        return (_cycle_position(frequency, t) < 0.5).astype(np.float32)
     
     def _get_cache_key(self, duration, carrier_freq, entrainment_freq, volume, 
                       sample_rate, carrier_type, modulation_type, duty_cycle):
@@ -258,9 +388,11 @@ class IsochronicToneGenerator:
             duty_cycle (float): The duty cycle for certain modulation types
             
         Returns:
-            tuple: A hashable tuple representing the parameters
+            tuple: A hashable tuple representing the parameters. The duration is
+            keyed by its sample count, so durations that produce the same
+            number of samples share one entry.
         """
-        return (duration, carrier_freq, entrainment_freq, volume, 
+        return (int(sample_rate * duration), carrier_freq, entrainment_freq, volume, 
                 sample_rate, carrier_type, modulation_type, duty_cycle)
     
     def generate_tone_segment(self, duration, carrier_freq, entrainment_freq, volume=0.5, 
@@ -291,25 +423,203 @@ class IsochronicToneGenerator:
                                        sample_rate, carrier_type, modulation_type, duty_cycle)
         
         # Check if result is in cache
-        if cache_key in self._cache:
-            return self._cache[cache_key]
+        cached = self._cache_lookup(self._cache, cache_key)
+        if cached is not None:
+            return cached
         
         # Ensure we're using the correct sample rate
         self.sample_rate = sample_rate
+        num_samples = int(sample_rate * duration)
         
-        # Generate carrier wave
-        carrier = self.generate_carrier(carrier_type, carrier_freq, duration, amplitude=0.8)
+        # Carrier and modulation are cached on their own parameters, so a
+        # volume or entrainment change does not regenerate the carrier
+        carrier_key = (carrier_type, carrier_freq, num_samples, sample_rate)
+        carrier = self._cache_lookup(self._carrier_cache, carrier_key)
+        if carrier is None:
+            carrier = self.generate_carrier(carrier_type, carrier_freq, duration)
+            self._cache_store(self._carrier_cache, carrier_key, carrier)
         
-        # Generate modulation envelope
-        modulation = self.generate_modulation(modulation_type, entrainment_freq, duration, duty_cycle)
+        modulation_key = (modulation_type, entrainment_freq, num_samples, sample_rate, duty_cycle)
+        modulation = self._cache_lookup(self._modulation_cache, modulation_key)
+        if modulation is None:
+            modulation = self.generate_modulation(modulation_type, entrainment_freq, duration, duty_cycle)
+            self._cache_store(self._modulation_cache, modulation_key, modulation)
         
-        # Apply modulation to carrier
-        output = carrier * modulation * volume
+        # Apply modulation and volume into a fresh output buffer
+        output = _apply_envelope(carrier, modulation, 0.8 * volume)
         
-        # Cache the result
-        self._cache[cache_key] = output
+        # Cache the result, evicting the least recently used segment
+        self._cache_store(self._cache, cache_key, output)
         
         return output
+    
+    def _cache_lookup(self, cache, key):
+        """Return a cached array and mark it most recently used, or None on a miss."""
+        value = cache.get(key)
+        if value is not None:
+            cache.move_to_end(key)
+        return value
+    
+    def _cache_store(self, cache, key, value):
+        """Store an array, evicting the least recently used entry past CACHE_SIZE."""
+        cache[key] = value
+        if len(cache) > self.CACHE_SIZE:
+            cache.popitem(last=False)
+    
+    def generate_frequency_transition(self, start_freq, end_freq, duration, transition_type="linear"):
+        """Generate a per-sample frequency array for smooth transitions.
+        
+        Args:
+            start_freq (float): The frequency at the start of the transition in Hz
+            end_freq (float): The frequency at the end of the transition in Hz
+            duration (float): The duration of the transition in seconds
+            transition_type (str, optional): One of "linear", "exponential",
+                "logarithmic", "quadratic" or "sigmoid". Defaults to "linear".
+            
+        Returns:
+            numpy.ndarray: The frequency of each sample in Hz
+        """
+        num_samples = int(self.sample_rate * duration)
+        
+        if transition_type == "exponential":
+            return np.logspace(
+                np.log10(max(0.1, start_freq)),  # Avoid log(0)
+                np.log10(end_freq),
+                num_samples
+            )
+            
+        elif transition_type == "logarithmic":
+            log_start = np.log(max(1.0, start_freq))
+            log_end = np.log(max(1.0, end_freq))
+            return np.exp(np.linspace(log_start, log_end, num_samples))
+            
+        elif transition_type == "quadratic":
+            t = np.linspace(0, 1, num_samples)
+            if start_freq < end_freq:
+                # Ease in
+                factor = t ** 2
+            else:
+                # Ease out
+                factor = 1 - (1 - t) ** 2
+            return start_freq + (end_freq - start_freq) * factor
+            
+        elif transition_type == "sigmoid":
+            t = np.linspace(-6, 6, num_samples)  # -6 to 6 gives good sigmoid range
+            sigmoid = 1 / (1 + np.exp(-t))
+            return start_freq + (end_freq - start_freq) * sigmoid
+        
+        # Linear transition (also the default if type is unknown)
+        return np.linspace(start_freq, end_freq, num_samples)
+    
+    def generate_advanced_isochronic(self, carrier_type=WaveformType.SINE,
+                                     modulation_type=ModulationType.SQUARE,
+                                     start_freq=10.0, end_freq=10.0, base_freq=100.0,
+                                     duration=60, volume=0.5, transition_type="linear",
+                                     duty_cycle=0.5, ramp_percent=10, out=None):
+        """Generate an isochronic tone whose entrainment frequency may glide.
+        
+        Args:
+            carrier_type (WaveformType, optional): The type of carrier wave. Defaults to WaveformType.SINE.
+            modulation_type (ModulationType, optional): The type of modulation. Defaults to ModulationType.SQUARE.
+            start_freq (float, optional): Entrainment frequency at the start in Hz. Defaults to 10.0.
+            end_freq (float, optional): Entrainment frequency at the end in Hz. Defaults to 10.0.
+            base_freq (float, optional): The carrier frequency in Hz. Defaults to 100.0.
+            duration (float, optional): The duration in seconds. Defaults to 60.
+            volume (float, optional): The volume of the tone (0.0 to 1.0). Defaults to 0.5.
+            transition_type (str, optional): See generate_frequency_transition. Defaults to "linear".
+            duty_cycle (float, optional): The duty cycle for certain modulation types. Defaults to 0.5.
+            ramp_percent (int, optional): The ramp percentage for trapezoid modulation. Defaults to 10.
+            out (numpy.ndarray, optional): float32 buffer of the segment's length that
+                receives the tone, e.g. a slice of a larger preset buffer.
+            
+        Returns:
+            tuple: A tuple containing:
+                - numpy.ndarray: The audio data (``out`` if given)
+                - int: The sample rate of the audio
+        """
+        num_samples = int(self.sample_rate * duration)
+        
+        # Carrier goes straight into the output buffer with the volume applied
+        tone = self.generate_carrier(carrier_type, base_freq, duration, amplitude=volume, out=out)
+        
+        if start_freq == end_freq:
+            modulation = self.generate_modulation(
+                modulation_type, start_freq, duration, duty_cycle, ramp_percent
+            )
+        else:
+            freq_array = self.generate_frequency_transition(
+                start_freq, end_freq, duration, transition_type
+            )
+            
+            # Accumulate phase in cycles, wrapping before narrowing to float32
+            cycles = np.zeros(num_samples)
+            np.cumsum(freq_array[:-1] / self.sample_rate, out=cycles[1:])
+            cycles -= np.floor(cycles)
+            phase = cycles.astype(np.float32)
+            phase *= np.float32(2 * np.pi)
+            square = (phase < np.pi).astype(np.float32)
+            
+            if modulation_type == ModulationType.SINE:
+                modulation = 0.5 * (1 + np.sin(phase))
+            elif modulation_type in (ModulationType.TRAPEZOID, ModulationType.GAUSSIAN):
+                # Shape the square pulses by convolving with a smoothing window
+                if modulation_type == ModulationType.TRAPEZOID:
+                    window_size = int(ramp_percent / 100 * self.sample_rate / np.mean(freq_array))
+                    window = np.bartlett(window_size * 2)
+                else:
+                    window_size = int(self.sample_rate / np.mean(freq_array))
+                    window = np.exp(-0.5 * np.linspace(-3, 3, window_size) ** 2)
+                if window_size > 1:
+                    modulation = scipy.signal.fftconvolve(square, window.astype(np.float32), mode='same')
+                    modulation /= np.max(modulation)
+                else:
+                    modulation = square
+            else:
+                # Square (also the default if type is unknown)
+                modulation = square
+        
+        # Apply modulation in place
+        np.multiply(tone, modulation, out=tone)
+        
+        # Apply fade in/out (10ms fade)
+        fade_samples = min(int(0.01 * self.sample_rate), num_samples // 10)
+        if fade_samples > 0:
+            fade = np.linspace(0, 1, fade_samples, dtype=np.float32)
+            tone[:fade_samples] *= fade
+            tone[-fade_samples:] *= fade[::-1]
+        
+        return tone, self.sample_rate
+    
+    def mix_with_background(self, isochronic_tone, background, background_volume=0.3):
+        """Mix an isochronic tone with background audio, looping or trimming it to fit.
+        
+        Args:
+            isochronic_tone (numpy.ndarray): The tone to mix into
+            background (numpy.ndarray): Mono background audio
+            background_volume (float, optional): Gain applied to the background. Defaults to 0.3.
+            
+        Returns:
+            numpy.ndarray: The mixed audio, normalized if it would clip
+        """
+        tone_length = len(isochronic_tone)
+        if tone_length == 0 or len(background) == 0:
+            return isochronic_tone
+        
+        # Repeat background if needed, then trim to the tone length
+        repeats = int(np.ceil(tone_length / len(background)))
+        if repeats > 1:
+            background = np.tile(background, repeats)
+        background = background[:tone_length]
+        
+        # Mix with volume adjustment
+        mixed_audio = isochronic_tone + background * background_volume
+        
+        # Normalize to avoid clipping
+        max_amplitude = np.max(np.abs(mixed_audio))
+        if max_amplitude > 1.0:
+            mixed_audio /= max_amplitude
+        
+        return mixed_audio
 
 
 class IsochronicPresetGenerator:
@@ -319,41 +629,55 @@ class IsochronicPresetGenerator:
         self.sample_rate = sample_rate
         self.tone_generator = IsochronicToneGenerator(sample_rate)
     
+    def _segment_layout(self, preset):
+        """Return the preset's total sample count and each segment's (segment, start, end)."""
+        total_samples = int(self.sample_rate * preset.get_total_duration())
+        current_pos = 0
+        layout = []
+        for segment in preset.segments:
+            segment_length = int(self.sample_rate * segment.duration)
+            end_pos = current_pos + segment_length
+            if end_pos > total_samples:
+                continue
+            layout.append((segment, current_pos, end_pos))
+            current_pos = end_pos
+        return total_samples, layout
+    
+    def _render_segment(self, preset, segment, out):
+        """Render one preset segment into the float32 buffer ``out``."""
+        self.tone_generator.generate_advanced_isochronic(
+            carrier_type=preset.carrier_type,
+            modulation_type=preset.modulation_type,
+            start_freq=segment.start_freq,
+            end_freq=segment.end_freq,
+            base_freq=segment.base_freq,
+            duration=segment.duration,
+            volume=segment.volume,
+            transition_type=segment.transition_type,
+            out=out
+        )
+    
     def generate_from_preset(self, preset, add_background=None, background_volume=0.3):
         """Generate complete audio from a preset with multiple segments"""
         if not preset.segments:
             return np.array([]), self.sample_rate
         
-        # Calculate total number of samples
-        total_duration = preset.get_total_duration()
-        total_samples = int(self.sample_rate * total_duration)
-        audio_data = np.zeros(total_samples)
+        # Lay out each segment's slice of the main audio buffer
+        total_samples, layout = self._segment_layout(preset)
+        audio_data = np.zeros(total_samples, dtype=np.float32)
         
-        # Current position in samples
-        current_pos = 0
+        def render(job):
+            segment, start, end = job
+            self._render_segment(preset, segment, audio_data[start:end])
         
-        # Process each segment
-        for segment in preset.segments:
-            # Generate audio for this segment
-            segment_audio, _ = self.tone_generator.generate_advanced_isochronic(
-                carrier_type=preset.carrier_type,
-                modulation_type=preset.modulation_type,
-                start_freq=segment.start_freq,
-                end_freq=segment.end_freq,
-                base_freq=segment.base_freq,
-                duration=segment.duration,
-                volume=segment.volume,
-                transition_type=segment.transition_type
-            )
-            
-            # Calculate segment position and length
-            segment_length = len(segment_audio)
-            end_pos = current_pos + segment_length
-            
-            # Add to main audio buffer
-            if end_pos <= total_samples:
-                audio_data[current_pos:end_pos] = segment_audio
-                current_pos = end_pos
+        # Segments write disjoint slices, so they can be rendered concurrently
+        # (NumPy/SciPy release the GIL in the heavy kernels)
+        if len(layout) > 1:
+            with ThreadPoolExecutor(max_workers=min(len(layout), os.cpu_count() or 1)) as executor:
+                list(executor.map(render, layout))
+        else:
+            for job in layout:
+                render(job)
         
         # Add background if provided
         if add_background is not None:
@@ -363,8 +687,42 @@ class IsochronicPresetGenerator:
         
         return audio_data, self.sample_rate
     
+    def stream_to_file(self, preset, output_file, file_format=None):
+        """Render a preset segment by segment straight into an audio file.
+        
+        Only one segment is held in memory at a time, so memory use does not
+        grow with the preset's total duration. Produces the same samples as
+        generate_from_preset without a background track.
+        
+        Args:
+            preset: The preset to render
+            output_file (str): Path of the file to write
+            file_format (str, optional): soundfile format name (e.g. "FLAC");
+                inferred from the file extension when omitted
+            
+        Returns:
+            str: The output file path
+        """
+        total_samples, layout = self._segment_layout(preset) if preset.segments else (0, [])
+        written = 0
+        with sf.SoundFile(output_file, "w", self.sample_rate, 1, format=file_format) as f:
+            for segment, start, end in layout:
+                buffer = np.empty(end - start, dtype=np.float32)
+                self._render_segment(preset, segment, buffer)
+                f.write(buffer)
+                written = end
+            if written < total_samples:
+                # Match the silent tail left in generate_from_preset's buffer
+                f.write(np.zeros(total_samples - written, dtype=np.float32))
+        return output_file
+    
     def export_to_file(self, preset, output_file, file_format="wav", add_background=None, background_volume=0.3):
         """Generate and export preset to audio file"""
+        # Without a background to normalize against, WAV/FLAC stream segment by segment
+        if add_background is None and file_format.lower() in ("wav", "flac"):
+            file_format = "FLAC" if file_format.lower() == "flac" else None
+            return self.stream_to_file(preset, output_file, file_format)
+        
         audio_data, sample_rate = self.generate_from_preset(preset, add_background, background_volume)
         
         if file_format.lower() == "wav":
@@ -373,26 +731,19 @@ class IsochronicPresetGenerator:
             sf.write(output_file, audio_data, sample_rate, format="FLAC")
         elif file_format.lower() == "mp3":
             try:
-                import soundfile as sf
-                # Write to temporary WAV first
-                import tempfile
-                import os
-                with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
-                    temp_wav = tmp.name
-                
-                sf.write(temp_wav, audio_data, sample_rate)
-                
-                # Convert to MP3 using ffmpeg or pydub if available
+                # Encode straight from 16-bit PCM in memory, no temporary WAV
+                pcm = (np.clip(audio_data, -1.0, 1.0) * 32767).astype(np.int16).tobytes()
                 try:
                     from pydub import AudioSegment
-                    sound = AudioSegment.from_wav(temp_wav)
+                    sound = AudioSegment(data=pcm, sample_width=2, frame_rate=sample_rate, channels=1)
                     sound.export(output_file, format="mp3", bitrate="192k")
                 except ImportError:
                     import subprocess
-                    subprocess.call(['ffmpeg', '-i', temp_wav, '-b:a', '192k', output_file])
-                
-                # Remove temporary file
-                os.unlink(temp_wav)
+                    subprocess.run(
+                        ['ffmpeg', '-y', '-f', 's16le', '-ar', str(sample_rate), '-ac', '1',
+                         '-i', 'pipe:0', '-b:a', '192k', output_file],
+                        input=pcm, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True
+                    )
             except Exception as e:
                 raise Exception(f"Failed to export as MP3: {str(e)}")
         else:
@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 from backend.db.session import (
+    LIST_BATCH_SIZE,
     configure_engine,
     create_db_and_tables,
     get_engine,
@@ -9,6 +10,7 @@ from backend.db.session import (
 )
 
 __all__ = [
+    "LIST_BATCH_SIZE",
     "configure_engine",
     "create_db_and_tables",
     "get_engine",
@@ -5,6 +5,7 @@ from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from sqlmodel import Session
 
 from backend.core.config import settings
@@ -34,7 +35,11 @@ def lifespan(_: FastAPI):
     yield
 
 
-app = FastAPI(title="IsoFlicker Backend", lifespan=lifespan)
+app = FastAPI(
+    title="IsoFlicker Backend",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 app.include_router(presets.router)
 app.include_router(logs.router)
 app.include_router(hardware.router)
@@ -4,7 +4,7 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Any, Optional
 
-from sqlalchemy import Column
+from sqlalchemy import Column, Index
 from sqlalchemy.dialects.sqlite import JSON
 from sqlmodel import Field, SQLModel
 
@@ -20,6 +20,8 @@ class Category(SQLModel, table=True):
 class Preset(SQLModel, table=True):
     """Preset definition loaded from the catalog."""
 
+    __table_args__ = (Index("ix_preset_category_label", "category", "label"),)
+
     id: str = Field(primary_key=True, index=True)
     category: str = Field(foreign_key="category.id")
     label: str
@@ -1,38 +1,82 @@
 """Utilities for loading preset metadata into the database."""
 from __future__ import annotations
 
-import json
+from functools import lru_cache
 from pathlib import Path
 from typing import Iterable
 
-from sqlmodel import Session, select
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import Session, SQLModel, select
 
 from .models import Category, Preset
 
+try:
+    from orjson import loads as _loads
+except ImportError:  # pragma: no cover - stdlib fallback
+    from json import loads as _loads
+
+_UPSERT_INSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+_catalog_version = 0
+
+
+def catalog_version() -> int:
+    """Return a counter that changes whenever the stored catalog is repopulated."""
+
+    return _catalog_version
+
+
+@lru_cache(maxsize=8)
+def _load_cached(path: str, mtime_ns: int) -> dict:
+    """Parse a catalog file once per modification time."""
+
+    return _loads(Path(path).read_bytes())
+
 
 def load_preset_catalog(path: Path) -> dict:
-    """Load the preset catalog JSON file."""
+    """Load the preset catalog JSON file.
 
-    with path.open("r", encoding="utf-8") as handle:
-        return json.load(handle)
+    The parsed catalog is cached per file modification time and shared between
+    callers, so it must be treated as read-only.
+    """
+
+    return _load_cached(str(path), path.stat().st_mtime_ns)
+
+
+def _upsert(session: Session, model: type[SQLModel], rows: list[dict]) -> None:
+    """Insert or update ``rows`` keyed on ``id`` in a single statement."""
+
+    if not rows:
+        return
+    insert = _UPSERT_INSERTS.get(session.get_bind().dialect.name)
+    if insert is None:
+        # No native upsert: split on the ids already stored and batch each half
+        existing = set(session.scalars(select(model.id).where(model.id.in_([row["id"] for row in rows]))))
+        session.bulk_update_mappings(model, [row for row in rows if row["id"] in existing])
+        session.bulk_insert_mappings(model, [row for row in rows if row["id"] not in existing])
+        return
+    stmt = insert(model).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["id"],
+        set_={column.name: column for column in stmt.excluded if column.name != "id"},
+    )
+    session.execute(stmt)
 
 
 def _ensure_categories(session: Session, data: dict) -> None:
     """Create or update category rows."""
 
-    for category_id, payload in data.get("categories", {}).items():
-        existing = session.exec(select(Category).where(Category.id == category_id)).first()
-        if existing:
-            existing.label = payload.get("label", existing.label)
-            existing.description = payload.get("description", existing.description)
-            continue
-        session.add(
-            Category(
-                id=category_id,
-                label=payload.get("label", category_id),
-                description=payload.get("description", ""),
-            )
-        )
+    categories = data.get("categories") or {}
+    rows = [
+        {
+            "id": category_id,
+            "label": payload.get("label", category_id),
+            "description": payload.get("description", ""),
+        }
+        for category_id, payload in categories.items()
+    ]
+    _upsert(session, Category, rows)
 
 
 def _normalize_audio_block(raw: dict | None, fallback: dict) -> dict:
@@ -109,23 +153,30 @@ def _build_preset_models(raw_presets: Iterable[dict]) -> Iterable[Preset]:
             safety_config=safety_block,
             max_volume_pct=safety_block.get("max_volume_pct"),
             photosensitivity_flag=bool(safety_block.get("photosensitivity_flag")),
-            citations=[int(value) for value in preset.get("citations", [])],
+            citations=list(preset.get("citations") or ()),
         )
 
 
+def _bump_catalog_version(_: Session) -> None:
+    """Invalidate cached listings once repopulated rows are committed."""
+
+    global _catalog_version
+    _catalog_version += 1
+
+
 def populate_presets(session: Session, catalog: dict) -> None:
-    """Populate presets and categories from catalog data."""
+    """Populate presets and categories from catalog data.
+
+    The catalog version advances when ``session`` next commits, so listings
+    cached while the upsert is still pending are rebuilt afterwards.
+    """
 
+    event.listen(session, "after_commit", _bump_catalog_version, once=True)
     _ensure_categories(session, catalog)
-    incoming: dict[str, Preset] = {}
+    incoming: dict[str, dict] = {}
     for item in _build_preset_models(catalog.get("presets", [])):
-        incoming[item.id] = item
-    existing_ids = set(session.exec(select(Preset.id)).all())
-    for preset_id, preset in incoming.items():
-        if preset_id in existing_ids:
-            session.merge(preset)
-        else:
-            session.add(preset)
+        incoming[item.id] = item.model_dump()
+    _upsert(session, Preset, list(incoming.values()))
 
 
-__all__ = ["load_preset_catalog", "populate_presets"]
+__all__ = ["catalog_version", "load_preset_catalog", "populate_presets"]
@@ -2,10 +2,11 @@
 from __future__ import annotations
 
 from fastapi import APIRouter, Depends, status
+from fastapi.responses import ORJSONResponse
 from sqlalchemy import desc
 from sqlmodel import Session, select
 
-from ..database import get_session
+from ..database import LIST_BATCH_SIZE, get_session
 from ..models import HardwareProfile
 from ..schemas import (
     HardwareProfileCreate,
@@ -14,8 +15,9 @@ from ..schemas import (
     LatencyResponse,
     MTFRequest,
     MTFResponse,
+    rows_as_payload,
 )
-from ..services.hardware_analysis import compute_mtf, estimate_latency
+from ..services.hardware_analysis import compute_mtf, decode_samples, estimate_latency
 
 router = APIRouter(prefix="/hardware", tags=["hardware"])
 
@@ -24,7 +26,13 @@ router = APIRouter(prefix="/hardware", tags=["hardware"])
 def analyze_mtf(payload: MTFRequest) -> MTFResponse:
     """Compute normalized modulation transfer scores."""
 
-    segments = [(segment.mod_rate_hz, segment.samples) for segment in payload.segments]
+    segments = [
+        (
+            segment.mod_rate_hz,
+            decode_samples(segment.sample_bytes) if segment.sample_bytes is not None else segment.samples,
+        )
+        for segment in payload.segments
+    ]
     scores, passed = compute_mtf(payload.sample_rate_hz, segments)
     return MTFResponse(mtf_scores=scores, passed_hz=passed)
 
@@ -61,12 +69,13 @@ def upsert_profile(
 
 
 @router.get("/profiles", response_model=list[HardwareProfileRead])
-def list_profiles(session: Session = Depends(get_session)) -> list[HardwareProfileRead]:
+def list_profiles(session: Session = Depends(get_session)) -> ORJSONResponse:
     """Return known hardware detector profiles ordered by recency."""
 
     tested_at_col = HardwareProfile.__table__.c.tested_at  # type: ignore[attr-defined]
-    rows = session.exec(select(HardwareProfile).order_by(desc(tested_at_col))).all()
-    return [HardwareProfileRead.model_validate(row) for row in rows]
+    statement = select(HardwareProfile).order_by(desc(tested_at_col))
+    rows = session.exec(statement.execution_options(yield_per=LIST_BATCH_SIZE))
+    return ORJSONResponse(rows_as_payload(HardwareProfileRead, rows))
 
 
 __all__ = ["router"]
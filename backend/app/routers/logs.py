@@ -2,12 +2,13 @@
 from __future__ import annotations
 
 from fastapi import APIRouter, Depends
+from fastapi.responses import ORJSONResponse
 from sqlalchemy import desc
 from sqlmodel import Session, select
 
-from ..database import get_session
+from ..database import LIST_BATCH_SIZE, get_session
 from ..models import SessionLog
-from ..schemas import SessionLogCreate, SessionLogRead
+from ..schemas import SessionLogCreate, SessionLogRead, rows_as_payload
 
 router = APIRouter(prefix="/logs", tags=["logs"])
 
@@ -24,12 +25,13 @@ def create_log(payload: SessionLogCreate, session: Session = Depends(get_session
 
 
 @router.get("/", response_model=list[SessionLogRead])
-def list_logs(session: Session = Depends(get_session)) -> list[SessionLogRead]:
+def list_logs(session: Session = Depends(get_session)) -> ORJSONResponse:
     """Return session logs ordered by newest first."""
 
     started_at_col = SessionLog.__table__.c.started_at  # type: ignore[attr-defined]
-    logs = session.exec(select(SessionLog).order_by(desc(started_at_col))).all()
-    return [SessionLogRead.model_validate(item) for item in logs]
+    statement = select(SessionLog).order_by(desc(started_at_col))
+    logs = session.exec(statement.execution_options(yield_per=LIST_BATCH_SIZE))
+    return ORJSONResponse(rows_as_payload(SessionLogRead, logs))
 
 
 __all__ = ["router"]
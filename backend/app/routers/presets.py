@@ -1,30 +1,57 @@
 """API routes for preset catalog queries."""
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Callable
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.engine import Engine
 from sqlmodel import Session, select
 
-from ..database import get_session
+from ..database import LIST_BATCH_SIZE, get_session
 from ..models import Category, Preset
-from ..schemas import CategoryRead, PresetRead
+from ..presets_loader import catalog_version
+from ..schemas import CategoryRead, PresetRead, rows_as_payload
 
 router = APIRouter(prefix="/presets", tags=["presets"])
 
+# Serialized catalog listings keyed by endpoint, valid for one (catalog version, engine).
+# The engine itself is part of the key: an id() could be reused by a new engine
+_listing_cache: dict[str, tuple[tuple[int, Engine], bytes]] = {}
+
+
+def _cached_listing(name: str, session: Session, build: Callable[[], list[dict]]) -> Response:
+    """Return a cached JSON listing, rebuilding it after the catalog is repopulated."""
+
+    key = (catalog_version(), session.get_bind())
+    cached = _listing_cache.get(name)
+    if cached is None or cached[0] != key:
+        cached = (key, ORJSONResponse(build()).body)
+        _listing_cache[name] = cached
+    return Response(content=cached[1], media_type="application/json")
+
 
 @router.get("/", response_model=list[PresetRead])
-def list_presets(session: Session = Depends(get_session)) -> list[PresetRead]:
+def list_presets(session: Session = Depends(get_session)) -> Response:
     """Return all presets ordered by category then label."""
 
-    presets = session.exec(select(Preset).order_by(Preset.category, Preset.label)).all()
-    return [PresetRead.model_validate(preset) for preset in presets]
+    def build() -> list[dict]:
+        statement = select(Preset).order_by(Preset.category, Preset.label)
+        presets = session.exec(statement.execution_options(yield_per=LIST_BATCH_SIZE))
+        return rows_as_payload(PresetRead, presets)
+
+    return _cached_listing("presets", session, build)
 
 
 @router.get("/categories", response_model=list[CategoryRead])
-def list_categories(session: Session = Depends(get_session)) -> list[CategoryRead]:
+def list_categories(session: Session = Depends(get_session)) -> Response:
     """Return all preset categories."""
 
-    categories = session.exec(select(Category).order_by(Category.id)).all()
-    return [CategoryRead.model_validate(category) for category in categories]
+    def build() -> list[dict]:
+        categories = session.exec(select(Category).order_by(Category.id))
+        return rows_as_payload(CategoryRead, categories)
+
+    return _cached_listing("categories", session, build)
 
 
 @router.get("/{preset_id}", response_model=PresetRead)
@@ -1,9 +1,12 @@
 """Pydantic/SQLModel schemas for API IO."""
 from __future__ import annotations
 
+import base64
+import binascii
 from datetime import datetime
-from typing import Any, Optional
+from typing import Any, Iterable, Optional
 
+from pydantic import PrivateAttr, model_validator
 from sqlmodel import Field, SQLModel
 
 
@@ -99,10 +102,39 @@ class HardwareProfileRead(HardwareProfileCreate):
 
 
 class ModulationSegment(SQLModel):
-    """Recorded segment for a modulation transfer computation."""
+    """Recorded segment for a modulation transfer computation.
+
+    Samples are sent either as a JSON number array or, for long recordings, as
+    base64-encoded little-endian float32 bytes in ``samples_b64``.
+    """
 
     mod_rate_hz: float
-    samples: list[float]
+    samples: list[float] = Field(default_factory=list)
+    samples_b64: Optional[str] = None
+    _sample_bytes: Optional[bytes] = PrivateAttr(default=None)
+
+    @model_validator(mode="after")
+    def _require_samples(self) -> "ModulationSegment":
+        """Reject segments without samples or with an undecodable ``samples_b64``."""
+
+        if self.samples_b64 is None:
+            if "samples" not in self.model_fields_set:
+                raise ValueError("segment requires samples or samples_b64")
+            return self
+        try:
+            data = base64.b64decode(self.samples_b64, validate=True)
+        except binascii.Error as exc:
+            raise ValueError("samples_b64 is not valid base64") from exc
+        if len(data) % 4:
+            raise ValueError("samples_b64 must hold whole float32 samples")
+        self._sample_bytes = data
+        return self
+
+    @property
+    def sample_bytes(self) -> Optional[bytes]:
+        """Raw float32 bytes decoded from ``samples_b64`` during validation."""
+
+        return self._sample_bytes
 
 
 class MTFRequest(SQLModel):
@@ -134,6 +166,13 @@ class LatencyResponse(SQLModel):
     jitter_ms: float
 
 
+def rows_as_payload(schema: type[SQLModel], rows: Iterable[Any]) -> list[dict[str, Any]]:
+    """Project trusted ORM rows onto ``schema``'s fields without validation."""
+
+    fields = tuple(schema.model_fields)
+    return [{name: getattr(row, name) for name in fields} for row in rows]
+
+
 __all__ = [
     "CategoryRead",
     "PresetRead",
@@ -145,4 +184,5 @@ __all__ = [
     "MTFResponse",
     "LatencyRequest",
     "LatencyResponse",
+    "rows_as_payload",
 ]
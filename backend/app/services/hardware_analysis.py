@@ -1,11 +1,14 @@
 """Signal-processing helpers for the hardware detector."""
 from __future__ import annotations
 
+import base64
+from functools import lru_cache
 from typing import Iterable
 
 import numpy as np
 from numpy.typing import NDArray
-from scipy.signal import hilbert, correlate  # type: ignore[import-untyped]
+from scipy.fft import irfft, next_fast_len, rfft  # type: ignore[import-untyped]
+from scipy.signal import hilbert  # type: ignore[import-untyped]
 
 from backend.core.config import settings
 
@@ -13,34 +16,77 @@ from backend.core.config import settings
 def _to_array(samples: Iterable[float]) -> NDArray[np.float64]:
     """Convert an iterable of floats to a numpy array."""
 
-    return np.asarray(list(samples), dtype=np.float64)
+    if isinstance(samples, np.ndarray):
+        return samples.astype(np.float64)
+    if isinstance(samples, (list, tuple)):
+        return np.asarray(samples, dtype=np.float64)
+    return np.fromiter(samples, dtype=np.float64)
 
 
-def _normalized_depth(envelope: NDArray[np.float64], sample_rate: int, target_hz: float) -> float:
-    """Compute modulation depth using Hilbert envelope and FFT ratio."""
+def decode_samples(encoded: bytes | str) -> NDArray[np.float64]:
+    """Decode little-endian float32 samples into a float64 array.
 
-    window = np.hanning(len(envelope))
-    spectrum = np.fft.rfft(envelope * window)
-    freqs = np.fft.rfftfreq(len(envelope), d=1.0 / sample_rate)
-    idx = int(np.argmin(np.abs(freqs - target_hz)))
-    mod_amp = float(np.abs(spectrum[idx]))
-    dc_amp = float(np.abs(spectrum[0])) or 1e-9
-    return float(np.clip(mod_amp / dc_amp, 0.0, 1.0))
+    ``encoded`` is either the raw bytes or their base64 text.
+    """
+
+    data = base64.b64decode(encoded) if isinstance(encoded, str) else encoded
+    return np.frombuffer(data, dtype="<f4").astype(np.float64)
+
+
+@lru_cache(maxsize=32)
+def _hann(length: int) -> NDArray[np.float64]:
+    """Return a read-only Hann window, cached by length."""
+
+    window = np.hanning(length)
+    window.setflags(write=False)
+    return window
+
+
+def _normalized_depth(
+    envelopes: NDArray[np.float64], sample_rate: int, target_hz: NDArray[np.float64]
+) -> NDArray[np.float64]:
+    """Compute modulation depth for each envelope row using an FFT ratio.
+
+    The rows are windowed in place, so ``envelopes`` is overwritten.
+    """
+
+    length = envelopes.shape[-1]
+    envelopes *= _hann(length)
+    spectrum = np.fft.rfft(envelopes, axis=-1)
+    # Nearest rFFT bin to each target (ties resolve to the lower bin)
+    idx = np.ceil(target_hz * length / sample_rate - 0.5).astype(np.intp)
+    np.clip(idx, 0, length // 2, out=idx)
+    mod_amp = np.abs(np.take_along_axis(spectrum, idx[:, None], axis=1)[:, 0])
+    dc_amp = np.abs(spectrum[:, 0])
+    dc_amp[dc_amp == 0.0] = 1e-9
+    return np.clip(mod_amp / dc_amp, 0.0, 1.0)
 
 
 def compute_mtf(sample_rate: int, segments: Iterable[tuple[float, Iterable[float]]]) -> tuple[dict[str, float], float | None]:
-    """Return normalized modulation transfer scores and highest passing rate."""
+    """Return normalized modulation transfer scores and highest passing rate.
+
+    Segments of equal length are analysed together with batched Hilbert and
+    FFT transforms along the last axis.
+    """
 
-    scores: dict[str, float] = {}
+    keys: list[str] = []
+    depths: list[float] = []
+    groups: dict[int, list[tuple[int, float, NDArray[np.float64]]]] = {}
     for mod_rate, samples in segments:
         data = _to_array(samples)
+        keys.append(f"{mod_rate:.0f}")
+        depths.append(0.0)
         if data.size < sample_rate // 4:
-            scores[f"{mod_rate:.0f}"] = 0.0
             continue
-        envelope = np.abs(hilbert(data))
-        envelope -= np.mean(envelope)
-        score = _normalized_depth(envelope, sample_rate, mod_rate)
-        scores[f"{mod_rate:.0f}"] = round(score, 4)
+        groups.setdefault(data.size, []).append((len(keys) - 1, mod_rate, data))
+    for group in groups.values():
+        positions = [position for position, _, _ in group]
+        rates = np.array([mod_rate for _, mod_rate, _ in group], dtype=np.float64)
+        envelopes = np.abs(hilbert(np.stack([data for _, _, data in group]), axis=-1))
+        envelopes -= envelopes.mean(axis=1, keepdims=True)
+        for position, depth in zip(positions, _normalized_depth(envelopes, sample_rate, rates)):
+            depths[position] = round(float(depth), 4)
+    scores = dict(zip(keys, depths))
     passed = max(
         (float(rate) for rate, score in scores.items() if score >= settings.mtf_pass_threshold),
         default=None,
@@ -53,16 +99,20 @@ def estimate_latency(reference: Iterable[float], recordings: Iterable[Iterable[f
 
     ref = _to_array(reference)
     ref -= np.mean(ref)
+    recs = [_to_array(recording) for recording in recordings]
     latencies: list[float] = []
-    for recording in recordings:
-        rec = _to_array(recording)
-        rec -= np.mean(rec)
-        corr = correlate(rec, ref, mode="full")
-        lag = int(np.argmax(corr) - (len(ref) - 1))
-        latencies.append(1000.0 * lag / sample_rate)
+    if recs:
+        # Correlate in the frequency domain, transforming the reference once
+        size = next_fast_len(len(ref) + max(len(rec) for rec in recs) - 1, real=True)
+        ref_spectrum = rfft(ref[::-1], size)
+        for rec in recs:
+            rec -= np.mean(rec)
+            corr = irfft(rfft(rec, size) * ref_spectrum, size)[: len(rec) + len(ref) - 1]
+            lag = int(np.argmax(corr) - (len(ref) - 1))
+            latencies.append(1000.0 * lag / sample_rate)
     mean_latency = float(np.mean(latencies)) if latencies else 0.0
     jitter = float(np.std(latencies, ddof=1)) if len(latencies) > 1 else 0.0
     return mean_latency, jitter
 
 
-__all__ = ["compute_mtf", "estimate_latency"]
+__all__ = ["compute_mtf", "decode_samples", "estimate_latency"]
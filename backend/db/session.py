@@ -3,18 +3,50 @@ from __future__ import annotations
 
 from typing import Iterator
 
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
 from sqlmodel import Session, SQLModel, create_engine
 
 from backend.core.config import settings
 
-_engine = create_engine(settings.database_url, echo=False, future=True)
+# Rows fetched per round-trip when list endpoints stream query results
+LIST_BATCH_SIZE = 500
+
+_SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+)
+
+
+def _set_sqlite_pragmas(dbapi_connection, _connection_record) -> None:
+    """Switch each new SQLite connection to WAL with relaxed fsync."""
+
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in _SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
+def _create_engine(database_url: str) -> Engine:
+    """Create an engine, tuning SQLite connections for write throughput."""
+
+    engine = create_engine(database_url, echo=False, future=True)
+    if engine.dialect.name == "sqlite":
+        event.listen(engine, "connect", _set_sqlite_pragmas)
+    return engine
+
+
+_engine = _create_engine(settings.database_url)
 
 
 def configure_engine(database_url: str) -> None:
     """Recreate the SQLModel engine (used by tests and CLI)."""
 
     global _engine
-    _engine = create_engine(database_url, echo=False, future=True)
+    _engine = _create_engine(database_url)
 
 
 def get_engine():
@@ -37,6 +69,7 @@ def get_session() -> Iterator[Session]:
 
 
 __all__ = [
+    "LIST_BATCH_SIZE",
     "configure_engine",
     "create_db_and_tables",
     "get_engine",
@@ -0,0 +1,22 @@
+"""Index presets by (category, label) for the ordered catalog listing."""
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20240705_02"
+down_revision = "20240705_01"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create the composite preset ordering index."""
+
+    op.create_index("ix_preset_category_label", "preset", ["category", "label"], unique=False)
+
+
+def downgrade() -> None:
+    """Drop the composite preset ordering index."""
+
+    op.drop_index("ix_preset_category_label", table_name="preset")
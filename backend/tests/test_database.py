@@ -0,0 +1,24 @@
+"""Tests for database engine configuration."""
+from __future__ import annotations
+
+from backend.app.database import get_engine
+
+
+def test_sqlite_engine_uses_wal_journal() -> None:
+    """SQLite connections are opened in WAL mode with NORMAL sync."""
+
+    with get_engine().connect() as connection:
+        assert connection.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+        assert connection.exec_driver_sql("PRAGMA synchronous").scalar() == 1
+
+
+def test_preset_listing_order_uses_index() -> None:
+    """The catalog ORDER BY is served by the (category, label) index."""
+
+    with get_engine().connect() as connection:
+        plan = connection.exec_driver_sql(
+            "EXPLAIN QUERY PLAN SELECT * FROM preset ORDER BY category, label"
+        ).all()
+    details = " ".join(row[-1] for row in plan)
+    assert "ix_preset_category_label" in details
+    assert "TEMP B-TREE" not in details
@@ -0,0 +1,26 @@
+"""Tests for the hardware detector signal analysis."""
+from __future__ import annotations
+
+import numpy as np
+
+from backend.app.services.hardware_analysis import compute_mtf
+
+
+def test_compute_mtf_handles_mixed_segment_lengths() -> None:
+    """Batched analysis scores each segment as if analysed alone."""
+
+    sample_rate = 8000
+    t = np.arange(sample_rate) / sample_rate
+    tone = np.sin(2 * np.pi * 1000 * t)
+    modulated = tone * (1 + 0.9 * np.sin(2 * np.pi * 40 * t))
+    segments = [
+        (40.0, modulated),
+        (20.0, tone[:100]),
+        (40.0, modulated[: sample_rate // 2]),
+    ]
+    scores, _ = compute_mtf(sample_rate, segments)
+    solo, _ = compute_mtf(sample_rate, [segments[2]])
+
+    assert list(scores) == ["40", "20"]
+    assert scores["20"] == 0.0
+    assert scores["40"] == solo["40"]
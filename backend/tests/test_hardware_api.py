@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import base64
+
 import numpy as np
 from fastapi.testclient import TestClient
 
@@ -28,6 +30,40 @@ def test_mtf_analysis_detects_modulation(client: TestClient) -> None:
     assert data["passed_hz"] == 90.0
 
 
+def test_mtf_analysis_accepts_base64_samples(client: TestClient) -> None:
+    """Base64 float32 segments should score like their JSON equivalents."""
+
+    sample_rate = 48000
+    samples = _am_signal(40.0, sample_rate, 0.5)
+    encoded = base64.b64encode(np.asarray(samples, dtype="<f4").tobytes()).decode("ascii")
+    as_json = client.post(
+        "/hardware/analyze/mtf",
+        json={"sample_rate_hz": sample_rate, "segments": [{"mod_rate_hz": 40.0, "samples": samples}]},
+    )
+    as_b64 = client.post(
+        "/hardware/analyze/mtf",
+        json={"sample_rate_hz": sample_rate, "segments": [{"mod_rate_hz": 40.0, "samples_b64": encoded}]},
+    )
+    assert as_b64.status_code == 200
+    assert as_b64.json() == as_json.json()
+    missing = client.post(
+        "/hardware/analyze/mtf",
+        json={"sample_rate_hz": sample_rate, "segments": [{"mod_rate_hz": 40.0}]},
+    )
+    assert missing.status_code == 422
+
+
+def test_mtf_analysis_rejects_malformed_base64(client: TestClient) -> None:
+    """Undecodable or partial-sample base64 payloads are request errors, not 500s."""
+
+    for encoded in ("not base64!", base64.b64encode(b"\x00" * 6).decode("ascii")):
+        response = client.post(
+            "/hardware/analyze/mtf",
+            json={"sample_rate_hz": 48000, "segments": [{"mod_rate_hz": 40.0, "samples_b64": encoded}]},
+        )
+        assert response.status_code == 422
+
+
 def test_latency_endpoint_returns_mean_and_jitter(client: TestClient) -> None:
     """Latency endpoint should detect injected offsets."""
 
@@ -1,7 +1,14 @@
 """Tests for preset endpoints."""
 from __future__ import annotations
 
+import copy
+
 from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from backend.app.config import settings
+from backend.app.database import get_engine
+from backend.app.presets_loader import load_preset_catalog, populate_presets
 
 
 def test_list_presets_returns_catalog(client: TestClient) -> None:
@@ -37,3 +44,19 @@ def test_list_categories(client: TestClient) -> None:
     data = response.json()
     assert any(item["id"] == "A" for item in data)
     assert any(item["id"] == "B" for item in data)
+
+
+def test_list_presets_refreshes_after_repopulate(client: TestClient) -> None:
+    """The cached listing is rebuilt when the catalog is populated again."""
+
+    first = client.get("/presets/").json()
+    assert client.get("/presets/").json() == first
+
+    catalog = copy.deepcopy(load_preset_catalog(settings.preset_file))
+    catalog["presets"][0]["label"] = "Zz relabelled"
+    with Session(get_engine()) as session:
+        populate_presets(session, catalog)
+        session.commit()
+
+    labels = [item["label"] for item in client.get("/presets/").json()]
+    assert "Zz relabelled" in labels
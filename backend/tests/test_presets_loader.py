@@ -0,0 +1,79 @@
+"""Tests for catalog loading into the database."""
+from __future__ import annotations
+
+import copy
+import os
+
+from sqlmodel import Session, select
+
+from backend.app.config import settings
+from backend.app.database import get_engine
+from backend.app.models import Category, Preset
+from backend.app import presets_loader
+from backend.app.presets_loader import load_preset_catalog, populate_presets
+
+
+def test_populate_presets_upserts_existing_rows() -> None:
+    """Re-populating updates seeded rows in place without duplicating them."""
+
+    catalog = copy.deepcopy(load_preset_catalog(settings.preset_file))
+    catalog["presets"][0]["label"] = "Relabelled"
+    first_id = catalog["presets"][0]["id"]
+    category_id = next(iter(catalog["categories"]))
+    catalog["categories"][category_id]["label"] = "Renamed"
+
+    with Session(get_engine()) as session:
+        before = len(session.exec(select(Preset)).all())
+        populate_presets(session, catalog)
+        session.commit()
+
+    with Session(get_engine()) as session:
+        assert len(session.exec(select(Preset)).all()) == before
+        assert session.get(Preset, first_id).label == "Relabelled"
+        assert session.get(Category, category_id).label == "Renamed"
+
+
+def test_load_preset_catalog_reparses_after_modification(tmp_path) -> None:
+    """The cached catalog is reused until the file changes on disk."""
+
+    path = tmp_path / "catalog.json"
+    path.write_text('{"presets": []}', encoding="utf-8")
+    first = load_preset_catalog(path)
+    assert load_preset_catalog(path) is first
+
+    path.write_text('{"presets": [], "categories": {}}', encoding="utf-8")
+    os.utime(path, ns=(0, path.stat().st_mtime_ns + 1))
+    assert load_preset_catalog(path) == {"presets": [], "categories": {}}
+
+
+def test_populate_presets_without_native_upsert(monkeypatch) -> None:
+    """Dialects without ON CONFLICT fall back to bulk update/insert mappings."""
+
+    monkeypatch.setattr(presets_loader, "_UPSERT_INSERTS", {})
+    catalog = copy.deepcopy(load_preset_catalog(settings.preset_file))
+    catalog["presets"][0]["label"] = "Fallback"
+    first_id = catalog["presets"][0]["id"]
+
+    with Session(get_engine()) as session:
+        session.delete(session.get(Preset, catalog["presets"][1]["id"]))
+        session.commit()
+        populate_presets(session, catalog)
+        session.commit()
+
+    with Session(get_engine()) as session:
+        assert len(session.exec(select(Preset)).all()) == len(catalog["presets"])
+        assert session.get(Preset, first_id).label == "Fallback"
+
+
+def test_catalog_version_advances_only_after_commit() -> None:
+    """Listings cached while the upsert is uncommitted must not outlive it."""
+
+    catalog = load_preset_catalog(settings.preset_file)
+    with Session(get_engine()) as session:
+        before = presets_loader.catalog_version()
+        populate_presets(session, catalog)
+        assert presets_loader.catalog_version() == before
+        session.commit()
+        assert presets_loader.catalog_version() == before + 1
+        session.commit()
+        assert presets_loader.catalog_version() == before + 1
@@ -1,26 +1,22 @@
 import sys
 import os
-import math
 import numpy as np
-import librosa
 import soundfile as sf
 import tempfile
 import traceback
 import cv2
-import multiprocessing as mp
+import itertools
 from PyQt5.QtCore import QThread, pyqtSignal
 
 # MoviePy imports with safe fallback
 try:
-    from moviepy.editor import VideoFileClip, AudioFileClip, CompositeAudioClip
+    from moviepy.editor import VideoFileClip, AudioFileClip
 except Exception:
     try:
         from moviepy.video.io.VideoFileClip import VideoFileClip
         from moviepy.audio.io.AudioFileClip import AudioFileClip
-        from moviepy.audio.AudioClip import CompositeAudioClip
     except Exception as _mp_err:
         raise _mp_err
-from moviepy.video.io.ImageSequenceClip import ImageSequenceClip
 
 # Import the advanced generator modules
 from advanced_isochronic_generator import (
@@ -30,7 +26,12 @@ from advanced_isochronic_generator import (
     generate_isochronic_tone
 )
 
-from core.ffmpeg_utils import ensure_ffmpeg_available
+from core.ffmpeg_utils import encoder_params, ensure_ffmpeg_available, probe_frame_count, write_video
+from core.flicker_kernels import apply_gain, flicker_factors, is_identity_gain, iter_scaled_frames
+
+# Sample rate and chunk length of the premixed original + tone track
+MIX_SAMPLE_RATE = 44100
+MIX_CHUNK_SECONDS = 1
 
 class EnhancedVideoProcessor(QThread):
     """Enhanced video processor with SINE presets, custom audio, and advanced visual effects.
@@ -95,20 +96,23 @@ class EnhancedVideoProcessor(QThread):
         except Exception as e:
             self.error_signal.emit(f"Error: {str(e)}\n{traceback.format_exc()}")
 
-    def _apply_text_overlays(self, frame, t, overlays):
-        """Draw text overlays onto a frame for a given time t.
+    @staticmethod
+    def _prep_overlays(overlays, width, height):
+        """Resolve text overlays into drawing records for frames of a given size.
         
-        This method applies text overlays to video frames using OpenCV text drawing
-        with alpha blending for smooth transitions. It handles positioning, timing,
-        and styling of text overlays.
+        Everything about an overlay except the frame it is drawn on is fixed for
+        the whole video, so attribute lookups, colour conversion, text metrics
+        and placement are done once here instead of for every frame.
         
         Args:
-            frame (numpy.ndarray): The video frame to apply overlays to
-            t (float): Current time in seconds
             overlays (list): List of overlay objects with text, timing, and styling properties
+            width (int): Frame width in pixels
+            height (int): Frame height in pixels
         
         Returns:
-            numpy.ndarray: The frame with text overlays applied
+            list: Tuples of (start, end, text, origin, scale, color, thickness,
+            opacity, box), where origin is relative to the box (x0, y0, x1, y1)
+            that the text is blended into
             
         Each overlay object should have the following attributes:
             - text (str): The text to display
@@ -119,122 +123,191 @@ class EnhancedVideoProcessor(QThread):
             - position (str): Text position ('center', 'top', 'bottom', 'left', 'right')
             - color (tuple): Text color as RGB tuple
         """
-        if not overlays:
-            return frame
+        prepared = []
+        for ov in overlays or ():
+            try:
+                start = float(getattr(ov, 'start_time', 0.0))
+                duration = float(getattr(ov, 'duration', 0.0))
+                if duration <= 0:
+                    continue
 
-        img = frame.copy()
-        try:
-            h, w = img.shape[:2]
-            for ov in overlays:
-                try:
-                    start = float(getattr(ov, 'start_time', 0.0))
-                    duration = float(getattr(ov, 'duration', 0.0))
-                    if duration <= 0:
-                        continue
-                    end = start + duration
-                    if not (start <= t <= end):
-                        continue
+                text = getattr(ov, 'text', '') or ''
+                opacity = max(0.0, min(1.0, float(getattr(ov, 'opacity', 1.0))))
+                font_size = int(getattr(ov, 'font_size', 24))
+                position = (getattr(ov, 'position', 'center') or 'center').lower()
+                color = getattr(ov, 'color', (255, 255, 255))
+                if hasattr(color, 'red'):
+                    color = (color.red(), color.green(), color.blue())
+
+                # Map font size to OpenCV scale.
+                scale = max(0.4, font_size / 32.0)
+                thickness = max(1, int(scale * 2))
 
-                    text = getattr(ov, 'text', '') or ''
-                    opacity = max(0.0, min(1.0, float(getattr(ov, 'opacity', 1.0))))
-                    font_size = int(getattr(ov, 'font_size', 24))
-                    position = (getattr(ov, 'position', 'center') or 'center').lower()
-                    color = getattr(ov, 'color', (255, 255, 255))
-                    if hasattr(color, 'red'):
-                        color = (color.red(), color.green(), color.blue())
+                # Calculate text size to position it.
+                (tw, th), baseline = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, scale, thickness)
+                x = (width - tw) // 2
+                y = (height + th) // 2
+                if 'top' in position:
+                    y = 20 + th
+                if 'bottom' in position:
+                    y = height - 20
+                if 'left' in position:
+                    x = 20
+                if 'right' in position:
+                    x = max(20, width - tw - 20)
 
-                    # Map font size to OpenCV scale.
-                    font = cv2.FONT_HERSHEY_SIMPLEX
-                    scale = max(0.4, font_size / 32.0)
-                    thickness = max(1, int(scale * 2))
+                # Only the text's bounding box changes, so draw and blend just
+                # that region (padded for stroke width and anti-aliasing)
+                pad = thickness + 2
+                x0, x1 = max(0, x - pad), min(width, x + tw + pad)
+                y0, y1 = max(0, y - th - pad), min(height, y + baseline + pad)
+                if x0 >= x1 or y0 >= y1:
+                    continue
+                prepared.append((start, start + duration, text, (x - x0, y - y0), scale,
+                                 color, thickness, opacity, (x0, y0, x1, y1)))
+            except Exception:
+                continue
+        return prepared
 
-                    # Calculate text size to position it.
-                    (tw, th), baseline = cv2.getTextSize(text, font, scale, thickness)
-                    x = (w - tw) // 2
-                    y = (h + th) // 2
-                    if 'top' in position:
-                        y = 20 + th
-                    if 'bottom' in position:
-                        y = h - 20
-                    if 'left' in position:
-                        x = 20
-                    if 'right' in position:
-                        x = max(20, w - tw - 20)
+    def _apply_text_overlays(self, frame, t, overlays):
+        """Draw text overlays onto a frame for a given time t.
+        
+        This method applies text overlays to video frames using OpenCV text drawing
+        with alpha blending for smooth transitions.
+        
+        Args:
+            frame (numpy.ndarray): The video frame to apply overlays to
+            t (float): Current time in seconds
+            overlays (list): Drawing records from ``_prep_overlays``
+        
+        Returns:
+            numpy.ndarray: The frame with text overlays applied
+        """
+        # Copied lazily: frames without a live overlay are returned untouched
+        img = frame
+        for start, end, text, origin, scale, color, thickness, opacity, box in overlays:
+            if not (start <= t <= end):
+                continue
+            try:
+                x0, y0, x1, y1 = box
+                if img is frame:
+                    img = frame.copy()
+                roi = img[y0:y1, x0:x1]
+                overlay_roi = roi.copy()
+                cv2.putText(overlay_roi, text, origin, cv2.FONT_HERSHEY_SIMPLEX, scale, color,
+                            thickness, cv2.LINE_AA)
 
-                    # Create overlay image and draw text on it
-                    overlay_img = img.copy()
-                    cv2.putText(overlay_img, text, (x, y), font, scale, color, thickness, cv2.LINE_AA)
+                # Alpha blend
+                img[y0:y1, x0:x1] = cv2.addWeighted(overlay_roi, opacity, roi, 1 - opacity, 0)
+            except Exception:
+                continue
+        return img
 
-                    # Alpha blend
-                    img = cv2.addWeighted(overlay_img, opacity, img, 1 - opacity, 0)
-                except Exception:
-                    continue
-            return img
-        except Exception:
-            return img
+    @staticmethod
+    def _curve_values(curve, times):
+        """Evaluate a preset frequency curve at an array of times."""
+        if hasattr(curve, 'get_values_at_times'):
+            return curve.get_values_at_times(times)
+        return np.array([curve.get_value_at_time(t) for t in times], dtype=np.float64)
 
     def _process_frame_batch(self, args):
         """Process a batch of frames in parallel.
         
-        This method is designed to be run in a separate process for parallel processing.
+        This method runs on a worker thread while the video is streamed.
         
         Args:
             args (tuple): A tuple containing:
                 - frames_data: List of tuples (frame_index, frame_data, time)
                 - config: Configuration dictionary
-                - text_overlays: Text overlays to apply
+                - text_overlays: Overlay records from ``_prep_overlays``
                 - preset: SINE preset with timeline information
                 - visual_type: Type of visual effect to apply
+                - out: Preallocated uint8 block of shape (batch, H, W, 3) that
+                  receives the frames, or None to allocate them
                 
         Returns:
             list: List of tuples (frame_index, modified_frame)
         """
-        frames_data, config, text_overlays, preset, visual_type = args
+        frames_data, config, text_overlays, preset, visual_type, out = args
         results = []
         
-        for frame_index, frame, t in frames_data:
+        # Evaluate the frequency curve and brightness factors for the whole batch
+        times = np.array([t for _, _, t in frames_data], dtype=np.float64)
+        if preset and hasattr(preset, 'entrainment_curve'):
+            frequencies = self._curve_values(preset.entrainment_curve, times)
+        else:
+            frequencies = config["visual_frequency"]
+        factors = flicker_factors(visual_type, config["flicker_amplitude"], frequencies, times)
+        
+        for k, ((frame_index, frame, t), factor) in enumerate(zip(frames_data, factors)):
             # Apply text overlays
             frame = self._apply_text_overlays(frame, t, text_overlays)
             
-            # Get current frequency from preset timeline if available
-            if preset and hasattr(preset, 'entrainment_curve'):
-                current_freq = preset.entrainment_curve.get_value_at_time(t)
-            else:
-                current_freq = config["visual_frequency"]
+            # Frames the factor would leave unchanged are passed through as-is
+            if frame.dtype == np.uint8 and is_identity_gain(factor):
+                results.append((frame_index, frame))
+                continue
             
-            # Apply different visual effects based on type
-            if visual_type == "pulse":
-                # Classic pulse effect
-                flicker_amp = config["flicker_amplitude"]
-                factor = 1.0 + flicker_amp * math.sin(2.0 * math.pi * current_freq * t)
-                factor = max(0, factor)
-                modified_frame = np.clip(frame.astype(np.float32) * factor, 0, 255).astype(np.uint8)
-            elif visual_type == "fade":
-                # Smooth fade effect
-                flicker_amp = config["flicker_amplitude"]
-                factor = 1.0 + flicker_amp * (0.5 + 0.5 * math.sin(2.0 * math.pi * current_freq * t))
-                factor = max(0, min(1.0, factor))
-                modified_frame = np.clip(frame.astype(np.float32) * factor, 0, 255).astype(np.uint8)
-            elif visual_type == "strobe":
-                # Strobe effect (more intense)
-                strobe_value = math.sin(2.0 * math.pi * current_freq * t)
-                if strobe_value > 0.5:
-                    modified_frame = np.clip(frame.astype(np.float32) * (1.0 + config["flicker_amplitude"]), 0, 255).astype(np.uint8)
-                elif strobe_value < -0.5:
-                    modified_frame = np.clip(frame.astype(np.float32) * (1.0 - config["flicker_amplitude"]), 0, 255).astype(np.uint8)
-                else:
-                    modified_frame = frame
-            else:
-                # Default to pulse
-                flicker_amp = config["flicker_amplitude"]
-                factor = 1.0 + flicker_amp * math.sin(2.0 * math.pi * current_freq * t)
-                factor = max(0, factor)
-                modified_frame = np.clip(frame.astype(np.float32) * factor, 0, 255).astype(np.uint8)
-            
-            results.append((frame_index, modified_frame))
+            # Scale the frame by the effect's brightness factor in one uint8 pass,
+            # straight into its slot of the output block when the shapes agree
+            target = out[k] if out is not None and out.shape[1:] == frame.shape else None
+            results.append((frame_index, apply_gain(frame, factor, out=target)))
         
         return results
 
+    def _iter_flicker_frames(self, video_clip, fps, frame_count, text_overlays, visual_type):
+        """Yield the flickered frames of ``video_clip`` in order.
+        
+        Frames are decoded sequentially and processed in batches on a thread
+        pool by ``iter_scaled_frames``, which keeps memory flat regardless of
+        the video's length and writes each batch into a recycled block.
+        """
+        preset = self.config.get("preset")
+        width, height = video_clip.size
+        text_overlays = self._prep_overlays(text_overlays, width, height)
+        
+        def timed_frames():
+            # One linear pass over the decoder instead of a get_frame lookup per index
+            frames = video_clip.iter_frames(fps=fps, dtype="uint8")
+            last_progress = None
+            for j, frame in zip(range(frame_count), frames):
+                # Only cross into the UI thread when the percentage moves
+                progress = 20 + int((j / frame_count) * 75)
+                if progress != last_progress:
+                    self.progress_signal.emit(progress)
+                    last_progress = progress
+                yield j, frame, j / fps
+        
+        def scale_batch(batch, block):
+            batch_args = (batch, self.config, text_overlays, preset, visual_type, block)
+            return [frame for _, frame in self._process_frame_batch(batch_args)]
+        
+        return iter_scaled_frames(timed_frames(), scale_batch, (height, width, 3))
+
+    @staticmethod
+    def _mix_audio(original_audio, tone_audio, original_volume, tone_volume, mixed_path):
+        """Mix two audio clips into a 16-bit wav over the original's duration.
+        
+        Both clips are sampled a chunk at a time and mixed with NumPy, so memory
+        stays bounded and no per-sample compositing happens at encode time.
+        The tone is treated as silent past its end.
+        """
+        fps = MIX_SAMPLE_RATE
+        total = int(original_audio.duration * fps)
+        chunk = MIX_CHUNK_SECONDS * fps
+        channels = max(original_audio.nchannels, tone_audio.nchannels)
+        with sf.SoundFile(mixed_path, mode='w', samplerate=fps, channels=channels,
+                          subtype='PCM_16') as mixed_file:
+            for start in range(0, total, chunk):
+                tt = np.arange(start, min(start + chunk, total)) / fps
+                mixed = np.zeros((len(tt), channels))
+                mixed += original_audio.to_soundarray(tt=tt, fps=fps).reshape(len(tt), -1) * original_volume
+                tone_tt = tt[tt < tone_audio.duration]
+                if len(tone_tt):
+                    tone = tone_audio.to_soundarray(tt=tone_tt, fps=fps).reshape(len(tone_tt), -1)
+                    mixed[:len(tone_tt)] += tone * tone_volume
+                mixed_file.write(np.clip(mixed, -1.0, 1.0))
+
     def process_video(self):
         """Process the video with enhanced features.
         
@@ -252,8 +325,6 @@ class EnhancedVideoProcessor(QThread):
         - Error handling and cleanup on failure
         """
         video_clip = None
-        final_clip = None
-        temp_dir = None
         try:
             # Make sure ffmpeg is available before touching MoviePy
             if not self._ensure_ffmpeg_path():
@@ -261,156 +332,105 @@ class EnhancedVideoProcessor(QThread):
                     "FFmpeg not found. Install FFmpeg or launch via startEnhancedIsoFlicker.bat "
                     "which wires the bundled ffmpeg into PATH."
                 )
-            # Create temporary directory for intermediate files
-            temp_dir = tempfile.mkdtemp()
-            temp_audio_path = self.isochronic_audio or os.path.join(temp_dir, "temp_audio.wav")
-            
-            # Load the original video
-            video_clip = VideoFileClip(self.video_path)
-            if not video_clip:
-                raise Exception("Failed to load video file")
-            
-            # Generate the isochronic tone if required and not provided externally
-            if self.config["use_audio_entrainment"] and not self.isochronic_audio:
-                # Generate isochronic tone
-                self.progress_signal.emit(10)
-                duration = video_clip.duration
-                sample_rate = 44100  # Standard audio sample rate
+            # Temporary directory for intermediate files, removed on success or error
+            with tempfile.TemporaryDirectory() as temp_dir:
+                temp_audio_path = self.isochronic_audio or os.path.join(temp_dir, "temp_audio.wav")
                 
-                # Check if we have a preset with a timeline
-                preset = self.config.get("preset")
-                if preset and hasattr(preset, 'generate_looped_audio'):
-                    # Generate audio using the preset
-                    tone_data, sr = preset.generate_looped_audio(duration, sample_rate)
-                else:
-                    # Generate using basic tone generator
-                    tone_data, sr = generate_isochronic_tone(
-                        self.config["tone_frequency"], 
-                        duration, 
-                        sample_rate, 
-                        self.config["tone_volume"],
-                        self.config.get("carrier_frequency", 100.0)
-                    )
+                # Load the original video
+                video_clip = VideoFileClip(self.video_path)
+                if not video_clip:
+                    raise Exception("Failed to load video file")
                 
-                # Write the tone to a temporary file if not already provided
-                if not self.isochronic_audio:
-                    sf.write(temp_audio_path, tone_data, sr)
-            
-            # Load the audio for the output
-            if self.config["use_audio_entrainment"]:
-                # Load the tone as an audio clip
-                tone_clip = AudioFileClip(temp_audio_path)
+                # Generate the isochronic tone if required and not provided externally
+                if self.config["use_audio_entrainment"] and not self.isochronic_audio:
+                    # Generate isochronic tone
+                    self.progress_signal.emit(10)
+                    duration = video_clip.duration
+                    sample_rate = 44100  # Standard audio sample rate
+                    
+                    # Check if we have a preset with a timeline
+                    preset = self.config.get("preset")
+                    if preset and hasattr(preset, 'iter_looped_audio'):
+                        # Stream the looped preset audio to disk chunk by chunk rather
+                        # than materializing the whole video's worth of samples
+                        with sf.SoundFile(temp_audio_path, mode='w', samplerate=sample_rate,
+                                          channels=1, subtype='PCM_16') as tone_file:
+                            for chunk in preset.iter_looped_audio(duration, sample_rate):
+                                tone_file.write(chunk)
+                    else:
+                        if preset and hasattr(preset, 'generate_looped_audio'):
+                            # Generate audio using the preset
+                            tone_data, sr = preset.generate_looped_audio(duration, sample_rate)
+                        else:
+                            # Generate using basic tone generator
+                            tone_data, sr = generate_isochronic_tone(
+                                self.config["tone_frequency"], 
+                                duration, 
+                                sample_rate, 
+                                self.config["tone_volume"],
+                                self.config.get("carrier_frequency", 100.0)
+                            )
+                        
+                        # Write the tone to a temporary file
+                        sf.write(temp_audio_path, tone_data, sr)
+                
+                # Determine output format
+                codec = "ffv1" if self.mode == "ffv1" else "libx264"
+                ext = ".mkv" if self.mode == "ffv1" else ".mp4"
+                audio_codec = "pcm_s16le" if self.mode == "ffv1" else "aac"
+                
+                base, _ = os.path.splitext(self.output_path)
+                output_file = base + ext
                 
-                # Mix with original audio if requested
-                if self.config["mix_with_original"] and video_clip.audio is not None:
-                    original_audio = video_clip.audio
-                    mixed_audio = CompositeAudioClip([
-                        original_audio.volumex(self.config["original_volume"]),
-                        tone_clip.volumex(self.config["tone_volume"])
-                    ])
-                    final_audio = mixed_audio
+                # Resolve the audio track ffmpeg should mux with the frames
+                if self.config["use_audio_entrainment"]:
+                    # Mix with original audio if requested
+                    if self.config["mix_with_original"] and video_clip.audio is not None:
+                        audio_path = os.path.join(temp_dir, "mixed_audio.wav")
+                        tone_clip = AudioFileClip(temp_audio_path)
+                        try:
+                            self._mix_audio(video_clip.audio, tone_clip, self.config["original_volume"],
+                                            self.config["tone_volume"], audio_path)
+                        finally:
+                            tone_clip.close()
+                    else:
+                        audio_path = temp_audio_path
                 else:
-                    final_audio = tone_clip
-            else:
-                # Use original audio
-                final_audio = video_clip.audio if video_clip.audio else None
-            
-            self.progress_signal.emit(20)
-            
-            # Process video frames with flicker effect if enabled
-            if self.config["use_visual_entrainment"]:
-                fps = video_clip.fps
-                frame_count = int(video_clip.duration * fps)
-                frames = [None] * frame_count  # Pre-allocate list
+                    # Use original audio
+                    audio_path = self.video_path if video_clip.audio is not None else None
                 
-                # Get visual effect type
-                visual_type = self.config.get("visual_type", "pulse").lower()
+                self.progress_signal.emit(20)
                 
-                # Get text overlays from preset if available
-                text_overlays = []
-                preset_for_overlays = self.config.get("preset")
-                if preset_for_overlays is not None and hasattr(preset_for_overlays, 'text_overlays'):
-                    text_overlays = preset_for_overlays.text_overlays or []
-
-                # Determine batch size based on CPU count
-                cpu_count = mp.cpu_count()
-                batch_size = max(1, frame_count // (cpu_count * 4))  # Process in smaller batches
+                fps = video_clip.fps
+                frame_count = probe_frame_count(video_clip, fps)
                 
-                # Create a pool of worker processes
-                with mp.Pool(processes=cpu_count) as pool:
-                    # Prepare batches of frames
-                    batches = []
-                    for i in range(0, frame_count, batch_size):
-                        batch_end = min(i + batch_size, frame_count)
-                        batch_frames = []
-                        
-                        # Collect frames for this batch
-                        for j in range(i, batch_end):
-                            if j % 10 == 0:  # Update progress every 10 frames
-                                progress = 20 + int((j / frame_count) * 60)
-                                self.progress_signal.emit(progress)
-                            
-                            t = j / fps
-                            frame = video_clip.get_frame(t)
-                            batch_frames.append((j, frame, t))
-                        
-                        # Add batch to processing queue
-                        batch_args = (batch_frames, self.config, text_overlays, self.config.get("preset"), visual_type)
-                        batches.append(batch_args)
+                # Process video frames with flicker effect if enabled
+                if self.config["use_visual_entrainment"]:
+                    # Get visual effect type
+                    visual_type = self.config.get("visual_type", "pulse").lower()
                     
-                    # Process batches in parallel
-                    batch_results = pool.map(self._process_frame_batch, batches)
+                    # Get text overlays from preset if available
+                    text_overlays = []
+                    preset_for_overlays = self.config.get("preset")
+                    if preset_for_overlays is not None and hasattr(preset_for_overlays, 'text_overlays'):
+                        text_overlays = preset_for_overlays.text_overlays or []
                     
-                    # Collect results
-                    for batch_result in batch_results:
-                        for frame_index, modified_frame in batch_result:
-                            frames[frame_index] = modified_frame
+                    frames = self._iter_flicker_frames(video_clip, fps, frame_count, text_overlays, visual_type)
+                else:
+                    # Use original frames with potentially modified audio
+                    self.progress_signal.emit(80)
+                    frames = itertools.islice(video_clip.iter_frames(fps=fps, dtype="uint8"), frame_count)
                 
-                # Create a clip from the modified frames
-                flicker_video = ImageSequenceClip(frames, fps=fps)
-                final_clip = flicker_video.set_audio(final_audio) if final_audio else flicker_video
-            else:
-                # Use original video with potentially modified audio
-                final_clip = video_clip.set_audio(final_audio) if final_audio else video_clip
-            
-            self.progress_signal.emit(80)
-            
-            # Determine output format
-            codec = "ffv1" if self.mode == "ffv1" else "libx264"
-            ext = ".mkv" if self.mode == "ffv1" else ".mp4"
-            
-            base, _ = os.path.splitext(self.output_path)
-            output_file = base + ext
-            
-            # Write the final video
-            if final_clip:
-                final_clip.write_videofile(
-                    output_file,
-                    codec=codec,
-                    audio_codec="pcm_s16le" if self.mode == "ffv1" else "aac",
-                    threads=4,
-                    ffmpeg_params=["-crf", "0", "-preset", 
-                                  "ultrafast" if self.mode == "ffv1" else "medium"]
-                )
-            else:
-                raise Exception("Failed to create output video clip")
-            
-            # Clean up resources
-            if video_clip and video_clip.audio:
-                video_clip.audio.close()
-            if video_clip:
-                video_clip.close()
-            if final_clip:
-                final_clip.close()
-            
-            # Clean up temporary files
-            if temp_dir:
-                try:
-                    if os.path.exists(temp_audio_path) and temp_audio_path != self.isochronic_audio:
-                        os.remove(temp_audio_path)
-                    os.rmdir(temp_dir)
-                except Exception as e:
-                    print(f"Warning: Failed to clean up temporary files: {e}")
+                # Stream decode -> encode without holding the video in memory
+                write_video(frames, output_file, tuple(video_clip.size), fps, codec,
+                            encoder_params(self.mode, self.config), audio_path, audio_codec,
+                            duration=frame_count / fps)
+                
+                # Clean up resources
+                if video_clip and video_clip.audio:
+                    video_clip.audio.close()
+                if video_clip:
+                    video_clip.close()
             
             self.progress_signal.emit(100)
             self.finished_signal.emit(output_file)
@@ -426,19 +446,5 @@ class EnhancedVideoProcessor(QThread):
                     video_clip.close()
                 except:
                     pass
-            if final_clip:
-                try:
-                    final_clip.close()
-                except:
-                    pass
-            
-            # Clean up temporary directory
-            if temp_dir and os.path.exists(temp_dir):
-                try:
-                    if os.path.exists(temp_audio_path) and temp_audio_path != self.isochronic_audio:
-                        os.remove(temp_audio_path)
-                    os.rmdir(temp_dir)
-                except:
-                    pass
             
             raise Exception(f"Error processing video: {str(e)}")
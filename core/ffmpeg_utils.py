@@ -1,6 +1,30 @@
 import os
+import shutil
 import subprocess
 
+import imageio_ffmpeg
+import numpy as np
+
+from export.advanced_export import AdvancedExportManager, ExportFormat, ExportPreset, QualityPreset
+
+# Bundled FFmpeg location: this file lives in <repo>/core/ffmpeg_utils.py
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_BIN_DIR = os.path.join(_REPO_ROOT, "ffmpeg-7.1-full_build", "bin")
+_CANDIDATE = os.path.join(_BIN_DIR, "ffmpeg.exe" if os.name == "nt" else "ffmpeg")
+
+# Result of the last probe and the environment it was made in
+_cached_result = None
+_cached_env = None
+
+
+def _ffmpeg_env():
+    """Environment values that decide which FFmpeg binary would be used."""
+    return os.environ.get("FFMPEG_BINARY"), os.environ.get("PATH")
+
+
+def _is_executable(path):
+    return os.path.isfile(path) and os.access(path, os.X_OK)
+
 
 def ensure_ffmpeg_available() -> bool:
     """Ensure FFmpeg binaries are discoverable by MoviePy and imageio.
@@ -11,33 +35,122 @@ def ensure_ffmpeg_available() -> bool:
 
     When a bundled binary exists, sets both `IMAGEIO_FFMPEG_EXE` and
     `FFMPEG_BINARY` and prepends the bin folder to PATH to expose `ffprobe`.
-    Returns True if FFmpeg can be invoked, else False.
+    Returns True if an executable FFmpeg binary was found, else False.
+
+    The result is cached until `FFMPEG_BINARY` or PATH changes, and the
+    binary is located with file checks rather than by spawning
+    `ffmpeg -version`.
     """
+    global _cached_result, _cached_env
+    if _cached_result is not None and _cached_env == _ffmpeg_env():
+        return _cached_result
     try:
-        # Compute repo root: this file lives in <repo>/core/ffmpeg_utils.py
-        repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        bin_dir = os.path.join(repo_root, "ffmpeg-7.1-full_build", "bin")
-        exe = "ffmpeg.exe" if os.name == "nt" else "ffmpeg"
-        candidate = os.path.join(bin_dir, exe)
-
-        if os.path.exists(candidate):
+        if os.path.exists(_CANDIDATE):
             # Wire env for both imageio-ffmpeg and MoviePy
-            os.environ["IMAGEIO_FFMPEG_EXE"] = candidate
-            os.environ["FFMPEG_BINARY"] = candidate
+            os.environ["IMAGEIO_FFMPEG_EXE"] = _CANDIDATE
+            os.environ["FFMPEG_BINARY"] = _CANDIDATE
             # Ensure ffprobe is reachable too
             current_path = os.environ.get("PATH", "")
-            if bin_dir not in current_path.split(os.pathsep):
-                os.environ["PATH"] = f"{bin_dir}{os.pathsep}{current_path}" if current_path else bin_dir
-
-        # Validate availability by calling ffmpeg -version
-        with open(os.devnull, "w") as devnull:
-            try:
-                # Prefer explicit candidate if we set it, else rely on PATH
-                cmd = [candidate, "-version"] if os.path.exists(candidate) else ["ffmpeg", "-version"]
-                subprocess.check_call(cmd, stdout=devnull, stderr=devnull)
-                return True
-            except Exception:
-                return False
+            if _BIN_DIR not in current_path.split(os.pathsep):
+                os.environ["PATH"] = f"{_BIN_DIR}{os.pathsep}{current_path}" if current_path else _BIN_DIR
+            result = _is_executable(_CANDIDATE)
+        else:
+            # Otherwise rely on PATH
+            result = shutil.which("ffmpeg") is not None
     except Exception:
-        return False
+        result = False
+    _cached_result, _cached_env = result, _ffmpeg_env()
+    return result
+
+
+def probe_frame_count(video_clip, fps):
+    """Number of frames in ``video_clip``, preferring the count ffmpeg probed.
+
+    ``duration * fps`` drifts on rounding and variable-frame-rate input; it is
+    only used when the reader exposes no count (``n_frames`` in MoviePy 2,
+    ``nframes`` in 1.x).
+    """
+    reader = video_clip.reader
+    count = getattr(reader, "n_frames", None) or getattr(reader, "nframes", None)
+    return int(count) if count else int(video_clip.duration * fps)
+
+
+def encoder_params(mode, config):
+    """ffmpeg quality parameters for a processor's output ``mode`` ('h264' or 'ffv1').
+
+    h264 output uses the export quality preset named by ``config['quality']``
+    ('low', 'medium', 'high' or 'lossless'; MEDIUM by default), with optional
+    ``crf`` and ``encoder_preset`` overrides. ffv1 output is always lossless.
+    The parameters come from ``AdvancedExportManager.get_ffmpeg_params``.
+    """
+    if mode == "ffv1":
+        preset = ExportPreset("Processor", ExportFormat.MKV_FFV1, QualityPreset.LOSSLESS)
+    else:
+        overrides = {}
+        if config.get("crf") is not None:
+            overrides["crf"] = config["crf"]
+        if config.get("encoder_preset"):
+            overrides["preset"] = config["encoder_preset"]
+        quality = QualityPreset(config.get("quality") or QualityPreset.MEDIUM.value)
+        preset = ExportPreset("Processor", ExportFormat.MP4_H264, quality, overrides)
+    return AdvancedExportManager().get_ffmpeg_params(preset)
+
+
+def write_video(frames, output_file, size, fps, codec, params, audio_path=None, audio_codec=None,
+                duration=None):
+    """Encode a stream of RGB uint8 frames with ffmpeg, muxing in ``audio_path`` if given.
 
+    Frames are piped to a single ffmpeg process as they arrive, so the video is
+    never held in memory. ``params`` are the encoder's quality options (see
+    ``encoder_params``). libx264 output is yuv420p, or yuv444p for odd frame
+    sizes; other codecs (ffv1) keep RGB as bgr0. Given ``duration`` (the video's length, ``frame_count /
+    fps``), an audio track is padded with silence or cut to exactly that long;
+    without it the output runs to the longer of the two streams. Short audio
+    never truncates the picture either way.
+    """
+    if codec == "libx264":
+        pix_fmt_out = "yuv420p" if size[0] % 2 == 0 and size[1] % 2 == 0 else "yuv444p"
+    else:
+        pix_fmt_out = "bgr0"
+    # Pad the audio with silence and stop both streams at the video's length
+    audio_params = ["-af", "apad", "-t", f"{duration:.6f}"] if audio_path and duration else []
+    writer = imageio_ffmpeg.write_frames(
+        output_file,
+        size,
+        fps=fps,
+        codec=codec,
+        pix_fmt_out=pix_fmt_out,
+        quality=None,
+        macro_block_size=1,
+        output_params=list(params) + ["-threads", "4"] + audio_params,
+        audio_path=audio_path,
+        audio_codec=audio_codec if audio_path else None,
+    )
+    writer.send(None)  # Start the ffmpeg process
+    try:
+        for frame in frames:
+            writer.send(np.ascontiguousarray(frame))
+    finally:
+        writer.close()
+
+
+def mix_audio(video_path, tone_path, original_volume, tone_volume, output_path, duration):
+    """Mix a video's audio track with a tone into a 16-bit wav using ffmpeg's amix.
+
+    Both inputs are scaled and summed in a single ffmpeg process. The video's
+    audio is padded with silence, so the result always runs for ``duration``
+    seconds (the video's length) even when that track is shorter.
+    """
+    filter_graph = (
+        f"[0:a]volume={original_volume},apad[orig];"
+        f"[1:a]volume={tone_volume}[tone];"
+        "[orig][tone]amix=inputs=2:duration=first:normalize=0[mix]"
+    )
+    subprocess.run(
+        [imageio_ffmpeg.get_ffmpeg_exe(), "-y", "-loglevel", "error",
+         "-i", video_path, "-i", tone_path,
+         "-filter_complex", filter_graph, "-map", "[mix]",
+         "-t", f"{duration:.6f}", "-c:a", "pcm_s16le", "-ar", "44100", output_path],
+        check=True,
+        capture_output=True,
+    )
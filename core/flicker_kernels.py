@@ -0,0 +1,145 @@
+"""
+Per-frame brightness kernels for visual entrainment.
+
+Every flicker effect scales a whole uint8 frame by one scalar factor, so the
+scaling is done with a 256-entry lookup table applied by ``cv2.LUT``: a single
+uint8-in/uint8-out pass that runs in OpenCV's SIMD code with the GIL released.
+"""
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+import cv2
+import numpy as np
+
+_LEVELS = np.arange(256, dtype=np.float32)
+
+# Frames handed to a worker at a time by iter_scaled_frames
+FRAME_BATCH_SIZE = 8
+
+# Approximate bytes of output blocks iter_scaled_frames keeps in flight; the
+# pending input batches take about as much again
+FRAME_BUFFER_BUDGET = 256 * 1024 * 1024
+
+
+def flicker_factors(visual_type, amplitude, frequencies, times):
+    """Return the brightness factors of a visual effect for a batch of frames.
+
+    Args:
+        visual_type (str): 'pulse', 'fade' or 'strobe' (anything else pulses)
+        amplitude (float): Flicker amplitude from the processing config
+        frequencies (float or numpy.ndarray): Visual entrainment frequency in Hz,
+            either constant or one value per frame
+        times (numpy.ndarray): Time of each frame in seconds
+
+    Returns:
+        numpy.ndarray: Factor to multiply each frame's pixel values by
+    """
+    times = np.asarray(times, dtype=np.float64)
+    wave = np.sin(2.0 * np.pi * np.asarray(frequencies, dtype=np.float64) * times)
+    if visual_type == "fade":
+        return np.clip(1.0 + amplitude * (0.5 + 0.5 * wave), 0.0, 1.0)
+    if visual_type == "strobe":
+        return np.select([wave > 0.5, wave < -0.5], [1.0 + amplitude, 1.0 - amplitude], 1.0)
+    return np.maximum(0.0, 1.0 + amplitude * wave)
+
+
+def gain_table(factor):
+    """Return the uint8 lookup table that scales pixel values by ``factor``.
+
+    Values are computed in float32, clipped to [0, 255] and truncated, exactly
+    like ``np.clip(frame.astype(np.float32) * factor, 0, 255).astype(np.uint8)``.
+    Tables are cached by the float32 factor, which is all that affects them, so
+    the few distinct factors of a periodic effect are built once per video.
+    """
+    return _gain_table(float(np.float32(factor)))
+
+
+@lru_cache(maxsize=1024)
+def _gain_table(factor):
+    table = np.clip(_LEVELS * np.float32(factor), 0, 255).astype(np.uint8)
+    table.setflags(write=False)
+    return table
+
+
+def is_identity_gain(factor):
+    """Return True if scaling by ``factor`` leaves every uint8 value unchanged.
+
+    This is decided on the lookup table itself, so factors just above 1.0 that
+    still truncate back to the input count as identity while ones just below
+    do not.
+    """
+    return _is_identity_gain(float(np.float32(factor)))
+
+
+@lru_cache(maxsize=1024)
+def _is_identity_gain(factor):
+    return bool(np.array_equal(_gain_table(factor), _LEVELS))
+
+
+def apply_gain(frame, factor, out=None):
+    """Scale a uint8 frame by ``factor`` with saturation in one pass.
+
+    Args:
+        frame (numpy.ndarray): uint8 frame of shape (H, W) or (H, W, C)
+        factor (float): Brightness factor
+        out (numpy.ndarray, optional): uint8 buffer of the frame's shape to
+            write into instead of allocating a new frame
+
+    Returns:
+        numpy.ndarray: The scaled frame (``out`` if given)
+    """
+    if frame.dtype != np.uint8:
+        scaled = np.clip(frame.astype(np.float32) * np.float32(factor), 0, 255)
+        if out is None:
+            return scaled.astype(np.uint8)
+        np.copyto(out, scaled, casting="unsafe")
+        return out
+    return cv2.LUT(frame, gain_table(factor), dst=out)
+
+
+def iter_scaled_frames(items, scale_batch, frame_shape, batch_size=FRAME_BATCH_SIZE):
+    """Scale a stream of frames on a thread pool and yield the results in order.
+
+    ``items`` are grouped into batches of ``batch_size`` and each batch is
+    handed to ``scale_batch(batch, block)``, which returns the batch's output
+    frames; ``block`` is a preallocated uint8 array of shape
+    ``(batch_size,) + frame_shape`` it may write them into. The number of
+    batches in flight is bounded by FRAME_BUFFER_BUDGET (at least two, at most
+    two per core), so memory stays flat however long the stream is and does
+    not grow with the core count, and each block is recycled once its frames
+    have been consumed. Workers run truly in parallel as long as
+    ``scale_batch`` releases the GIL, as ``apply_gain`` does.
+    """
+    cores = os.cpu_count() or 1
+    block_bytes = batch_size * int(np.prod(frame_shape))
+    max_pending = max(2, min(cores * 2, FRAME_BUFFER_BUDGET // max(1, block_bytes)))
+    workers = min(cores, max_pending)
+    pending = deque()
+    free_blocks = deque(
+        np.empty((batch_size,) + tuple(frame_shape), dtype=np.uint8) for _ in range(max_pending)
+    )
+
+    def drain_oldest():
+        future, block = pending.popleft()
+        yield from future.result()
+        free_blocks.append(block)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        def submit(batch):
+            block = free_blocks.popleft()
+            pending.append((executor.submit(scale_batch, batch, block), block))
+
+        batch = []
+        for item in items:
+            batch.append(item)
+            if len(batch) == batch_size:
+                submit(batch)
+                batch = []
+                if len(pending) >= max_pending:
+                    yield from drain_oldest()
+        if batch:
+            submit(batch)
+        while pending:
+            yield from drain_oldest()
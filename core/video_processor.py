@@ -1,6 +1,7 @@
 import sys
 import os
-import math
+import functools
+import itertools
 import numpy as np
 import librosa
 import soundfile as sf
@@ -10,15 +11,19 @@ from PyQt5.QtCore import QThread, pyqtSignal
 
 # MoviePy imports with safe fallback
 try:
-    from moviepy.editor import VideoFileClip, AudioFileClip, CompositeAudioClip
+    from moviepy.editor import VideoFileClip
 except Exception:
     try:
         from moviepy.video.io.VideoFileClip import VideoFileClip
-        from moviepy.audio.io.AudioFileClip import AudioFileClip
-        from moviepy.audio.AudioClip import CompositeAudioClip
     except Exception as _mp_err:
         raise _mp_err
-from moviepy.video.io.ImageSequenceClip import ImageSequenceClip
+
+from advanced_isochronic_generator import sine_wave
+from core.ffmpeg_utils import encoder_params, mix_audio, probe_frame_count, write_video
+from core.flicker_kernels import apply_gain, flicker_factors, is_identity_gain, iter_scaled_frames
+
+# Sample rate audio is resampled to before beat tracking
+BEAT_TRACK_SAMPLE_RATE = 22050
 
 
 def generate_isochronic_tone(frequency, duration, sample_rate=44100, volume=0.5, carrier_frequency=100.0):
@@ -44,18 +49,21 @@ def generate_isochronic_tone(frequency, duration, sample_rate=44100, volume=0.5,
         >>> len(tone_data)
         220500
     """
-    # Generate time array
-    t = np.linspace(0, duration, int(sample_rate * duration), endpoint=False)
-    
-    # Create sine wave at the specified carrier frequency
-    sine_wave = np.sin(2 * np.pi * carrier_frequency * t)
+    num_samples = int(sample_rate * duration)
     
-    # Create amplitude modulation envelope for isochronic effect (square wave)
-    mod_freq = frequency  # Use entrainment frequency for modulation
-    envelope = 0.5 * (1 + np.sign(np.sin(2 * np.pi * mod_freq * t)))
+    # Create sine wave at the specified carrier frequency, scaled by the volume;
+    # the block rotation avoids a sin call per sample on long buffers
+    isochronic_tone = sine_wave(carrier_frequency, sample_rate, num_samples,
+                                np.empty(num_samples, dtype=np.float32))
+    isochronic_tone *= np.float32(volume)
     
-    # Apply envelope to sine wave
-    isochronic_tone = sine_wave * envelope * volume
+    # Square-wave isochronic envelope: the carrier sounds for the first half of
+    # each entrainment cycle and is silent for the second half. Cycle counts
+    # are wrapped to [0, 1) in float64 to keep long buffers phase-accurate
+    cycles = np.arange(num_samples, dtype=np.float64)
+    cycles *= frequency / sample_rate
+    cycles -= np.floor(cycles)
+    isochronic_tone[cycles >= 0.5] = 0.0
     
     return isochronic_tone, sample_rate
 
@@ -76,9 +84,24 @@ def detect_isochronic_frequency(audio_path):
         >>> freq = detect_isochronic_frequency("audio.wav")
         >>> print(freq)
         8.5
+    
+    Results are cached per file path, size and modification time, so analyzing
+    an unchanged file again does not repeat the beat tracking.
     """
     try:
-        y, sr = librosa.load(audio_path, sr=None, mono=True)
+        stat = os.stat(audio_path)
+    except OSError as e:
+        print(f"Error detecting frequency: {e}")
+        return 10.0
+    return _detect_frequency_cached(os.path.abspath(audio_path), stat.st_size, stat.st_mtime_ns)
+
+
+@functools.lru_cache(maxsize=32)
+def _detect_frequency_cached(audio_path, size, mtime_ns):
+    try:
+        # Beat tracking works at librosa's default 22050 Hz analysis rate, so
+        # there is no need to run the onset envelope at the file's native rate
+        y, sr = librosa.load(audio_path, sr=BEAT_TRACK_SAMPLE_RATE, mono=True)
         tempo_bpm, _ = librosa.beat.beat_track(y=y, sr=sr)
         if tempo_bpm <= 0:
             return 10.0
@@ -130,6 +153,12 @@ class BaseVideoProcessor(QThread):
             - use_visual_entrainment (bool): Whether to apply visual entrainment
             - flicker_amplitude (float): Strength of visual flicker effect
             - visual_frequency (float): Visual entrainment frequency in Hz
+        
+        Optional keys (h264 only; ffv1 output is always lossless):
+            - quality (str): Export quality preset, 'low', 'medium', 'high' or
+              'lossless'; defaults to 'medium' (CRF 25)
+            - crf (int): Overrides the quality preset's constant rate factor
+            - encoder_preset (str): Overrides the quality preset's x264 speed preset
         """
         super().__init__()
         self.video_path = video_path
@@ -148,130 +177,123 @@ class BaseVideoProcessor(QThread):
         This method should be overridden by subclasses to implement specific processing logic.
         """
         video_clip = None
-        final_clip = None
-        temp_dir = None
         try:
-            # Create temporary directory for intermediate files
-            temp_dir = tempfile.mkdtemp()
-            temp_audio_path = os.path.join(temp_dir, "temp_audio.wav")
-            
-            # Load the original video
-            video_clip = VideoFileClip(self.video_path)
-            if not video_clip:
-                raise Exception("Failed to load video file")
-            
-            # Generate the isochronic tone if required
-            if self.config["use_audio_entrainment"]:
-                # Generate isochronic tone
-                self.progress_signal.emit(10)
-                duration = video_clip.duration
-                sample_rate = 44100  # Standard audio sample rate
+            # Temporary directory for intermediate files, removed on success or error
+            with tempfile.TemporaryDirectory() as temp_dir:
+                temp_audio_path = os.path.join(temp_dir, "temp_audio.wav")
                 
-                # Generate main tone
-                tone_data, sr = generate_isochronic_tone(
-                    self.config["tone_frequency"], 
-                    duration, 
-                    sample_rate, 
-                    self.config["tone_volume"],
-                    self.config.get("carrier_frequency", 100.0)  # Pass carrier frequency
-                )
+                # Load the original video
+                video_clip = VideoFileClip(self.video_path)
+                if not video_clip:
+                    raise Exception("Failed to load video file")
                 
-                # Write the tone to a temporary file
-                sf.write(temp_audio_path, tone_data, sr)
+                # Generate the isochronic tone if required
+                if self.config["use_audio_entrainment"]:
+                    # Generate isochronic tone
+                    self.progress_signal.emit(10)
+                    duration = video_clip.duration
+                    sample_rate = 44100  # Standard audio sample rate
+                    
+                    # Generate main tone
+                    tone_data, sr = generate_isochronic_tone(
+                        self.config["tone_frequency"], 
+                        duration, 
+                        sample_rate, 
+                        self.config["tone_volume"],
+                        self.config.get("carrier_frequency", 100.0)  # Pass carrier frequency
+                    )
+                    
+                    # Write the tone to a temporary 16-bit wav for ffmpeg to mux
+                    sf.write(temp_audio_path, tone_data, sr, subtype="PCM_16")
+                    
+                    # Mix with original audio if requested
+                    if self.config["mix_with_original"] and video_clip.audio is not None:
+                        # The tone already carries tone_volume from generation, so it
+                        # is mixed in at unit gain rather than scaled a second time
+                        audio_path = os.path.join(temp_dir, "mixed_audio.wav")
+                        mix_audio(self.video_path, temp_audio_path, self.config["original_volume"],
+                                  1.0, audio_path, duration)
+                    else:
+                        # ffmpeg muxes the tone wav as-is, so it is never decoded again
+                        audio_path = temp_audio_path
+                else:
+                    # Use original audio
+                    audio_path = self.video_path if video_clip.audio is not None else None
                 
-                # Load the tone as an audio clip
-                tone_clip = AudioFileClip(temp_audio_path)
+                self.progress_signal.emit(20)
                 
-                # Mix with original audio if requested
-                if self.config["mix_with_original"] and video_clip.audio is not None:
-                    original_audio = video_clip.audio
-                    mixed_audio = CompositeAudioClip([
-                        original_audio.volumex(self.config["original_volume"]),
-                        tone_clip.volumex(self.config["tone_volume"])
-                    ])
-                    final_audio = mixed_audio
-                else:
-                    final_audio = tone_clip
-            else:
-                # Use original audio
-                final_audio = video_clip.audio if video_clip.audio else None
-            
-            self.progress_signal.emit(20)
-            
-            # Process video frames with flicker effect if enabled
-            if self.config["use_visual_entrainment"]:
-                fps = video_clip.fps
-                frame_count = int(video_clip.duration * fps)
-                # Pre-allocate list for better memory management
-                frames = [None] * frame_count
+                # Determine output format
+                codec = "ffv1" if self.mode == "ffv1" else "libx264"
+                ext = ".mkv" if self.mode == "ffv1" else ".mp4"
+                audio_codec = "pcm_s16le" if self.mode == "ffv1" else "aac"
                 
-                # Pre-calculate constants
-                flicker_amp = self.config["flicker_amplitude"]
-                flicker_freq = self.config["visual_frequency"]
+                base, _ = os.path.splitext(self.output_path)
+                output_file = base + ext
+                
+                fps = video_clip.fps
+                frame_count = probe_frame_count(video_clip, fps)
+                # Decode in one sequential pass instead of a get_frame lookup per timestamp
+                frame_iter = itertools.islice(video_clip.iter_frames(fps=fps, dtype="uint8"), frame_count)
                 
-                # Process each frame with the flicker effect
-                for i in range(frame_count):
-                    if i % 10 == 0:  # Update progress every 10 frames
-                        progress = 20 + int((i / frame_count) * 60)
-                        self.progress_signal.emit(progress)
+                # Process video frames with flicker effect if enabled
+                if self.config["use_visual_entrainment"]:
+                    # Brightness factor of every frame: a sine wave at the visual
+                    # frequency, computed once for the whole video
+                    factors = flicker_factors(
+                        "pulse",
+                        self.config["flicker_amplitude"],
+                        self.config["visual_frequency"],
+                        np.arange(frame_count) / fps
+                    )
+                    # Frames whose factor leaves every pixel value unchanged are
+                    # passed through without being scaled or copied
+                    unchanged = np.fromiter(map(is_identity_gain, factors), dtype=bool, count=frame_count)
                     
-                    t = i / fps
-                    frame = video_clip.get_frame(t)
+                    def scale_batch(batch, block):
+                        # Scale a batch of (index, frame) pairs into the rows of block
+                        scaled = []
+                        for k, (i, frame) in enumerate(batch):
+                            if unchanged[i]:
+                                scaled.append(frame)
+                            else:
+                                out = block[k] if block.shape[1:] == frame.shape else None
+                                scaled.append(apply_gain(frame, factors[i], out))
+                        return scaled
                     
-                    # Apply flicker effect using sine wave at the specified frequency
-                    factor = 1.0 + flicker_amp * math.sin(2.0 * math.pi * flicker_freq * t)
-                    factor = max(0, factor)
+                    def indexed_frames():
+                        # Only cross into the UI thread when the percentage moves
+                        last_progress = None
+                        for i, frame in enumerate(frame_iter):
+                            progress = 20 + int((i / frame_count) * 60)
+                            if progress != last_progress:
+                                self.progress_signal.emit(progress)
+                                last_progress = progress
+                            yield i, frame
                     
-                    # Apply the brightness factor to the frame
-                    # Use more efficient data type conversion
-                    modified_frame = np.clip(frame.astype(np.float32, copy=False) * factor, 0, 255).astype(np.uint8)
-                    frames[i] = modified_frame
+                    def flickered_frames():
+                        # Batches are scaled on a thread pool (OpenCV releases the GIL)
+                        # while decoding and encoding continue
+                        width, height = video_clip.size
+                        return iter_scaled_frames(indexed_frames(), scale_batch, (height, width, 3))
+                    
+                    # A zero amplitude leaves the whole video untouched
+                    frames = frame_iter if unchanged.all() else flickered_frames()
+                else:
+                    # Use original frames with potentially modified audio
+                    frames = frame_iter
                 
-                # Create a clip from the modified frames
-                flicker_video = ImageSequenceClip(frames, fps=fps)
-                final_clip = flicker_video.set_audio(final_audio) if final_audio else flicker_video
-            else:
-                # Use original video with potentially modified audio
-                final_clip = video_clip.set_audio(final_audio) if final_audio else video_clip
-            
-            self.progress_signal.emit(80)
-            
-            # Determine output format
-            codec = "ffv1" if self.mode == "ffv1" else "libx264"
-            ext = ".mkv" if self.mode == "ffv1" else ".mp4"
-            
-            base, _ = os.path.splitext(self.output_path)
-            output_file = base + ext
-            
-            # Write the final video
-            if final_clip:
-                final_clip.write_videofile(
-                    output_file,
-                    codec=codec,
-                    audio_codec="pcm_s16le" if self.mode == "ffv1" else "aac",
-                    threads=4,
-                    ffmpeg_params=["-crf", "0", "-preset", 
-                                  "ultrafast" if self.mode == "ffv1" else "medium"]
-                )
-            else:
-                raise Exception("Failed to create output video clip")
-            
-            # Clean up resources
-            if video_clip and video_clip.audio:
-                video_clip.audio.close()
-            if video_clip:
-                video_clip.close()
-            if final_clip:
-                final_clip.close()
-            
-            # Clean up temporary files
-            if temp_dir:
-                try:
-                    if os.path.exists(temp_audio_path):
-                        os.remove(temp_audio_path)
-                    os.rmdir(temp_dir)
-                except Exception as e:
-                    print(f"Warning: Failed to clean up temporary files: {e}")
+                # Stream decode -> encode without holding the video in memory
+                write_video(frames, output_file, tuple(video_clip.size), fps, codec,
+                            encoder_params(self.mode, self.config), audio_path, audio_codec,
+                            duration=frame_count / fps)
+                
+                self.progress_signal.emit(80)
+                
+                # Clean up resources
+                if video_clip and video_clip.audio:
+                    video_clip.audio.close()
+                if video_clip:
+                    video_clip.close()
             
             self.progress_signal.emit(100)
             self.finished_signal.emit(output_file)
@@ -287,19 +309,5 @@ class BaseVideoProcessor(QThread):
                     video_clip.close()
                 except:
                     pass
-            if final_clip:
-                try:
-                    final_clip.close()
-                except:
-                    pass
-            
-            # Clean up temporary directory
-            if temp_dir and os.path.exists(temp_dir):
-                try:
-                    if os.path.exists(temp_audio_path):
-                        os.remove(temp_audio_path)
-                    os.rmdir(temp_dir)
-                except:
-                    pass
             
             raise Exception(f"Error processing video: {str(e)}")
\ No newline at end of file
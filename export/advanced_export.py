@@ -1,7 +1,11 @@
 import os
 import json
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
+
+import imageio_ffmpeg
 
 
 class ExportFormat(Enum):
@@ -27,6 +31,105 @@ class QualityPreset(Enum):
     CUSTOM = "custom"
 
 
+# Container and codec choices for each export format
+_FORMAT_OPTIONS: Dict[ExportFormat, Dict[str, Any]] = {
+    ExportFormat.MP4_H264: {
+        "extension": ".mp4",
+        "codec": "libx264",
+        "audio_codec": "aac",
+        "container": "mp4"
+    },
+    ExportFormat.MP4_H265: {
+        "extension": ".mp4",
+        "codec": "libx265",
+        "audio_codec": "aac",
+        "container": "mp4"
+    },
+    ExportFormat.MKV_FFV1: {
+        "extension": ".mkv",
+        "codec": "ffv1",
+        "audio_codec": "pcm_s16le",
+        "container": "matroska"
+    },
+    ExportFormat.MKV_H264: {
+        "extension": ".mkv",
+        "codec": "libx264",
+        "audio_codec": "aac",
+        "container": "matroska"
+    },
+    ExportFormat.AVI_DV: {
+        "extension": ".avi",
+        "codec": "dvvideo",
+        "audio_codec": "pcm_s16le",
+        "container": "avi"
+    },
+    ExportFormat.WEBM_VP9: {
+        "extension": ".webm",
+        "codec": "libvpx-vp9",
+        "audio_codec": "libopus",
+        "container": "webm"
+    },
+    ExportFormat.MOV_PRORES: {
+        "extension": ".mov",
+        "codec": "prores",
+        "audio_codec": "aac",
+        "container": "mov"
+    },
+    ExportFormat.WAV: {
+        "extension": ".wav",
+        "codec": None,
+        "audio_codec": "pcm_s16le",
+        "container": None
+    },
+    ExportFormat.FLAC: {
+        "extension": ".flac",
+        "codec": None,
+        "audio_codec": "flac",
+        "container": None
+    },
+    ExportFormat.MP3: {
+        "extension": ".mp3",
+        "codec": None,
+        "audio_codec": "libmp3lame",
+        "container": None
+    }
+}
+
+# Encoder settings for each quality preset
+_QUALITY_SETTINGS: Dict[QualityPreset, Dict[str, Any]] = {
+    QualityPreset.LOW: {
+        "video_bitrate": "1000k",
+        "audio_bitrate": "128k",
+        "crf": 30,
+        "preset": "fast"
+    },
+    QualityPreset.MEDIUM: {
+        "video_bitrate": "2500k",
+        "audio_bitrate": "192k",
+        "crf": 25,
+        "preset": "medium"
+    },
+    QualityPreset.HIGH: {
+        "video_bitrate": "5000k",
+        "audio_bitrate": "256k",
+        "crf": 20,
+        "preset": "slow"
+    },
+    QualityPreset.LOSSLESS: {
+        "video_bitrate": None,
+        "audio_bitrate": None,
+        "crf": 0,
+        "preset": "veryslow"
+    },
+    QualityPreset.CUSTOM: {
+        "video_bitrate": None,
+        "audio_bitrate": None,
+        "crf": None,
+        "preset": "medium"
+    }
+}
+
+
 class ExportPreset:
     """Export preset with configuration options"""
     
@@ -57,6 +160,15 @@ class ExportPreset:
         )
 
 
+def _encode_one(video_path: str, output_path: str, params: List[str], audio_only: bool) -> str:
+    """Encode ``video_path`` to ``output_path`` with one ffmpeg process"""
+    command = [imageio_ffmpeg.get_ffmpeg_exe(), "-y", "-loglevel", "error", "-i", video_path]
+    if audio_only:
+        command.append("-vn")
+    subprocess.run(command + params + [output_path], check=True, capture_output=True)
+    return output_path
+
+
 class AdvancedExportManager:
     """Advanced export manager with multiple format and quality options"""
     
@@ -99,105 +211,11 @@ class AdvancedExportManager:
     
     def get_format_options(self, format: ExportFormat) -> Dict[str, Any]:
         """Get format-specific options"""
-        format_options = {
-            ExportFormat.MP4_H264: {
-                "extension": ".mp4",
-                "codec": "libx264",
-                "audio_codec": "aac",
-                "container": "mp4"
-            },
-            ExportFormat.MP4_H265: {
-                "extension": ".mp4",
-                "codec": "libx265",
-                "audio_codec": "aac",
-                "container": "mp4"
-            },
-            ExportFormat.MKV_FFV1: {
-                "extension": ".mkv",
-                "codec": "ffv1",
-                "audio_codec": "pcm_s16le",
-                "container": "matroska"
-            },
-            ExportFormat.MKV_H264: {
-                "extension": ".mkv",
-                "codec": "libx264",
-                "audio_codec": "aac",
-                "container": "matroska"
-            },
-            ExportFormat.AVI_DV: {
-                "extension": ".avi",
-                "codec": "dvvideo",
-                "audio_codec": "pcm_s16le",
-                "container": "avi"
-            },
-            ExportFormat.WEBM_VP9: {
-                "extension": ".webm",
-                "codec": "libvpx-vp9",
-                "audio_codec": "libopus",
-                "container": "webm"
-            },
-            ExportFormat.MOV_PRORES: {
-                "extension": ".mov",
-                "codec": "prores",
-                "audio_codec": "aac",
-                "container": "mov"
-            },
-            ExportFormat.WAV: {
-                "extension": ".wav",
-                "codec": None,
-                "audio_codec": "pcm_s16le",
-                "container": None
-            },
-            ExportFormat.FLAC: {
-                "extension": ".flac",
-                "codec": None,
-                "audio_codec": "flac",
-                "container": None
-            },
-            ExportFormat.MP3: {
-                "extension": ".mp3",
-                "codec": None,
-                "audio_codec": "libmp3lame",
-                "container": None
-            }
-        }
-        return format_options.get(format, {})
+        return dict(_FORMAT_OPTIONS.get(format, {}))
     
     def get_quality_settings(self, quality: QualityPreset) -> Dict[str, Any]:
         """Get quality-specific settings"""
-        quality_settings = {
-            QualityPreset.LOW: {
-                "video_bitrate": "1000k",
-                "audio_bitrate": "128k",
-                "crf": 30,
-                "preset": "fast"
-            },
-            QualityPreset.MEDIUM: {
-                "video_bitrate": "2500k",
-                "audio_bitrate": "192k",
-                "crf": 25,
-                "preset": "medium"
-            },
-            QualityPreset.HIGH: {
-                "video_bitrate": "5000k",
-                "audio_bitrate": "256k",
-                "crf": 20,
-                "preset": "slow"
-            },
-            QualityPreset.LOSSLESS: {
-                "video_bitrate": None,
-                "audio_bitrate": None,
-                "crf": 0,
-                "preset": "veryslow"
-            },
-            QualityPreset.CUSTOM: {
-                "video_bitrate": None,
-                "audio_bitrate": None,
-                "crf": None,
-                "preset": "medium"
-            }
-        }
-        return quality_settings.get(quality, {})
+        return dict(_QUALITY_SETTINGS.get(quality, {}))
     
     def create_custom_preset(self, name: str, format: ExportFormat, quality: QualityPreset,
                            video_bitrate: Optional[str] = None, audio_bitrate: Optional[str] = None,
@@ -244,10 +262,10 @@ class AdvancedExportManager:
         params = []
         
         # Get format options
-        format_options = self.get_format_options(preset.format)
+        format_options = _FORMAT_OPTIONS.get(preset.format, {})
         
         # Get quality settings
-        quality_settings = self.get_quality_settings(preset.quality)
+        quality_settings = _QUALITY_SETTINGS.get(preset.quality, {})
         
         # Combine with custom settings
         settings = {**quality_settings, **preset.custom_settings}
@@ -277,7 +295,39 @@ class AdvancedExportManager:
             params.extend(["-profile:v", "3"])  # Proxy, LT, Standard, HQ, 4444, 4444XQ
         
         return params
-
+    
+    def batch_export(self, video_path: str, preset_names: List[str], output_dir: str) -> List[str]:
+        """Export a video to several presets at once, one ffmpeg process per preset.
+        
+        Outputs are named ``<video name>_<preset name><extension>`` in
+        ``output_dir`` and returned in the order of ``preset_names``. Up to one
+        encode per core runs at a time, and the cores are split between them
+        with ``-threads`` so multithreaded encoders do not oversubscribe the CPU.
+        
+        Raises:
+            ValueError: If any of ``preset_names`` is not a known preset
+        """
+        missing = [name for name in preset_names if name not in self.presets]
+        if missing:
+            raise ValueError(f"Unknown export presets: {', '.join(missing)}")
+        if not preset_names:
+            return []
+        
+        cores = os.cpu_count() or 1
+        workers = min(len(preset_names), cores)
+        threads = ["-threads", str(max(1, cores // workers))]
+        base = os.path.splitext(os.path.basename(video_path))[0]
+        jobs = []
+        for name in preset_names:
+            preset = self.presets[name]
+            format_options = _FORMAT_OPTIONS.get(preset.format, {})
+            file_name = f"{base}_{preset.name.replace(' ', '_')}{format_options.get('extension', '')}"
+            jobs.append((video_path, os.path.join(output_dir, file_name),
+                         self.get_ffmpeg_params(preset) + threads, format_options.get("codec") is None))
+        
+        os.makedirs(output_dir, exist_ok=True)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(lambda job: _encode_one(*job), jobs))
 
 def main():
     """Example usage of the advanced export manager"""
@@ -8,12 +8,117 @@ This script installs all improvements to the IsoFlicker Pro software:
 - Enhanced SINE editor
 """
 
+import contextlib
 import os
 import sys
 import shutil
 import tempfile
 import re
 
+# Rewrites applied to isoFlickerGUI.py: group name -> (pattern, replacement
+# template). They touch disjoint parts of the file, so they are fused into a
+# single alternation and applied in one pass
+_GUI_REWRITES = {
+    # Add carrier frequency control after tone frequency
+    "tone_freq": (
+        r"tone_freq_layout\.addWidget\(self\.tone_freq_spin\)\s+",
+        r"""\g<tone_freq>
+        carrier_freq_layout = QHBoxLayout()
+        carrier_freq_layout.addWidget(QLabel("Carrier Frequency (Hz):"))
+        self.carrier_freq_spin = QDoubleSpinBox()
+        self.carrier_freq_spin.setRange(20.0, 1000.0)
+        self.carrier_freq_spin.setValue(100.0)  # Default to 100Hz
+        self.carrier_freq_spin.setSingleStep(10.0)
+        carrier_freq_layout.addWidget(self.carrier_freq_spin)
+        
+        """,
+    ),
+    # Add carrier frequency layout to audio layout
+    "audio_layout": (
+        r"audio_layout\.addWidget\(self\.use_audio_check\)\s+audio_layout\.addLayout\(tone_freq_layout\)\s+",
+        r"""\g<audio_layout>audio_layout.addLayout(carrier_freq_layout)
+        """,
+    ),
+    # Update get_config to include carrier frequency
+    "config": (
+        r"\"tone_frequency\": self\.tone_freq_spin\.value\(\),\s+\"tone_volume\": self\.tone_volume_slider\.value\(\) \/ 100,\s+",
+        r"""\g<config>"carrier_frequency": self.carrier_freq_spin.value(),
+            """,
+    ),
+    # Update generate_isochronic_tone function to use carrier frequency
+    "tone_signature": (
+        r"def generate_isochronic_tone\(frequency, duration, sample_rate=44100, volume=0\.5\):",
+        r"def generate_isochronic_tone(frequency, duration, sample_rate=44100, volume=0.5, carrier_frequency=100.0):",
+    ),
+    # Update sine wave generation to use carrier frequency
+    "sine_wave": (
+        r"# Create sine wave at the specified frequency\s+sine_wave = np\.sin\(2 \* np\.pi \* frequency \* t\)",
+        r"# Create sine wave at the specified carrier frequency\n    sine_wave = np.sin(2 * np.pi * carrier_frequency * t)",
+    ),
+    # Update modulation envelope to use entrainment frequency
+    "mod_envelope": (
+        r"# Create amplitude modulation envelope for isochronic effect \(square wave\)\s+mod_freq = frequency",
+        r"# Create amplitude modulation envelope for isochronic effect (square wave)\n    mod_freq = frequency  # Use entrainment frequency for modulation",
+    ),
+    # Update FlickerWorker.process_video to pass carrier frequency
+    "tone_call": (
+        r"tone_data, sr = generate_isochronic_tone\(\s+self\.config\[\"tone_frequency\"\],\s+duration,\s+sample_rate,\s+self\.config\[\"tone_volume\"\]\s+\)",
+        r"""tone_data, sr = generate_isochronic_tone(
+                    self.config["tone_frequency"], 
+                    duration, 
+                    sample_rate, 
+                    self.config["tone_volume"],
+                    self.config.get("carrier_frequency", 100.0)  # Pass carrier frequency
+                )""",
+    ),
+}
+
+_GUI_PATTERN = re.compile("|".join(
+    f"(?P<{name}>{pattern})" for name, (pattern, _) in _GUI_REWRITES.items()
+))
+
+
+def _rewrite_gui_match(match):
+    """Expand the replacement template of whichever rewrite matched"""
+    return match.expand(_GUI_REWRITES[match.lastgroup][1])
+
+def _backup(path, backup_file):
+    """Keep the current ``path`` as ``backup_file`` with its mode and timestamps.
+
+    Targets are never rewritten in place, only replaced by renaming a new
+    file over them, so a hard link to the original is a complete backup at no
+    cost; where links are unsupported the file is copied instead.
+    """
+    if os.path.lexists(backup_file):
+        os.remove(backup_file)
+    try:
+        os.link(path, backup_file)
+    except OSError:
+        shutil.copy2(path, backup_file)
+
+@contextlib.contextmanager
+def _replacing(path, mode="w"):
+    """Open a temporary file beside ``path`` that is renamed over it on success.
+
+    The original stays in place until the new contents are completely written,
+    and the new file keeps the original's permission bits.
+    """
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+    try:
+        with os.fdopen(fd, mode) as f:
+            yield f
+        if os.path.exists(path):
+            shutil.copymode(path, temp_path)
+        else:
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(temp_path, 0o666 & ~umask)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
 def update_isoflickergui():
     """Update the isoFlickerGUI.py file to add carrier frequency control"""
     print("Updating isoFlickerGUI.py...")
@@ -21,7 +126,7 @@ def update_isoflickergui():
     # Backup the original file
     if os.path.exists("isoFlickerGUI.py"):
         backup_file = "isoFlickerGUI.py.bak"
-        shutil.copy2("isoFlickerGUI.py", backup_file)
+        _backup("isoFlickerGUI.py", backup_file)
         print(f"Backup created: {backup_file}")
     else:
         print("Error: isoFlickerGUI.py not found")
@@ -32,67 +137,12 @@ def update_isoflickergui():
         with open("isoFlickerGUI.py", "r") as f:
             original_code = f.read()
         
-        # Add carrier frequency control after tone frequency
-        pattern = r"(tone_freq_layout\.addWidget\(self\.tone_freq_spin\)\s+)"
-        replacement = r"""\1
-        carrier_freq_layout = QHBoxLayout()
-        carrier_freq_layout.addWidget(QLabel("Carrier Frequency (Hz):"))
-        self.carrier_freq_spin = QDoubleSpinBox()
-        self.carrier_freq_spin.setRange(20.0, 1000.0)
-        self.carrier_freq_spin.setValue(100.0)  # Default to 100Hz
-        self.carrier_freq_spin.setSingleStep(10.0)
-        carrier_freq_layout.addWidget(self.carrier_freq_spin)
-        
-        """
-        
-        updated_code = re.sub(pattern, replacement, original_code)
-        
-        # Add carrier frequency layout to audio layout
-        pattern = r"(audio_layout\.addWidget\(self\.use_audio_check\)\s+audio_layout\.addLayout\(tone_freq_layout\)\s+)"
-        replacement = r"""\1audio_layout.addLayout(carrier_freq_layout)
-        """
-        
-        updated_code = re.sub(pattern, replacement, updated_code)
-        
-        # Update get_config to include carrier frequency
-        pattern = r"(\"tone_frequency\": self\.tone_freq_spin\.value\(\),\s+\"tone_volume\": self\.tone_volume_slider\.value\(\) \/ 100,\s+)"
-        replacement = r"""\1"carrier_frequency": self.carrier_freq_spin.value(),
-            """
-        
-        updated_code = re.sub(pattern, replacement, updated_code)
-        
-        # Update generate_isochronic_tone function to use carrier frequency
-        pattern = r"(def generate_isochronic_tone\(frequency, duration, sample_rate=44100, volume=0\.5\):)"
-        replacement = r"def generate_isochronic_tone(frequency, duration, sample_rate=44100, volume=0.5, carrier_frequency=100.0):"
-        
-        updated_code = re.sub(pattern, replacement, updated_code)
-        
-        # Update sine wave generation to use carrier frequency
-        pattern = r"(# Create sine wave at the specified frequency\s+sine_wave = np\.sin\(2 \* np\.pi \* frequency \* t\))"
-        replacement = r"# Create sine wave at the specified carrier frequency\n    sine_wave = np.sin(2 * np.pi * carrier_frequency * t)"
-        
-        updated_code = re.sub(pattern, replacement, updated_code)
+        # Apply all carrier frequency rewrites in a single pass
+        updated_code = _GUI_PATTERN.sub(_rewrite_gui_match, original_code)
         
-        # Update modulation envelope to use entrainment frequency
-        pattern = r"(# Create amplitude modulation envelope for isochronic effect \(square wave\)\s+mod_freq = frequency)"
-        replacement = r"# Create amplitude modulation envelope for isochronic effect (square wave)\n    mod_freq = frequency  # Use entrainment frequency for modulation"
-        
-        updated_code = re.sub(pattern, replacement, updated_code)
-        
-        # Update FlickerWorker.process_video to pass carrier frequency
-        pattern = r"(tone_data, sr = generate_isochronic_tone\(\s+self\.config\[\"tone_frequency\"\],\s+duration,\s+sample_rate,\s+self\.config\[\"tone_volume\"\]\s+\))"
-        replacement = r"""tone_data, sr = generate_isochronic_tone(
-                    self.config["tone_frequency"], 
-                    duration, 
-                    sample_rate, 
-                    self.config["tone_volume"],
-                    self.config.get("carrier_frequency", 100.0)  # Pass carrier frequency
-                )"""
-        
-        updated_code = re.sub(pattern, replacement, updated_code)
-        
-        # Write the updated code to the file
-        with open("isoFlickerGUI.py", "w") as f:
+        # Write the updated code beside the file and swap it in, so the
+        # original is untouched unless the write succeeds
+        with _replacing("isoFlickerGUI.py") as f:
             f.write(updated_code)
         
         print("Successfully updated isoFlickerGUI.py")
@@ -100,10 +150,7 @@ def update_isoflickergui():
         
     except Exception as e:
         print(f"Error updating isoFlickerGUI.py: {e}")
-        # Restore the backup if an error occurred
-        if os.path.exists(backup_file):
-            shutil.copy2(backup_file, "isoFlickerGUI.py")
-            print("Restored original file from backup")
+        print("The original file was left unchanged")
         return False
 
 def update_integrated_file():
@@ -129,29 +176,27 @@ def update_sine_editor():
     """Update the sine_editor.py file with improved version"""
     print("Updating sine_editor.py...")
     
+    # Check if the new editor file exists
+    if not os.path.exists("sine_editor_with_xml.py"):
+        print("Error: sine_editor_with_xml.py not found")
+        return False
+    
     # Backup the original file if it exists
     if os.path.exists("sine_editor.py"):
         backup_file = "sine_editor.py.bak"
-        shutil.copy2("sine_editor.py", backup_file)
+        _backup("sine_editor.py", backup_file)
         print(f"Backup created: {backup_file}")
     
     try:
-        # Check if the new editor file exists
-        if not os.path.exists("sine_editor_with_xml.py"):
-            print("Error: sine_editor_with_xml.py not found")
-            return False
-        
-        # Replace the original with the improved version
-        shutil.copy2("sine_editor_with_xml.py", "sine_editor.py")
+        # Replace the original with the improved version in one rename
+        with _replacing("sine_editor.py", "wb") as f, open("sine_editor_with_xml.py", "rb") as src:
+            shutil.copyfileobj(src, f)
         print("Successfully updated sine_editor.py")
         return True
     
     except Exception as e:
         print(f"Error updating sine_editor.py: {e}")
-        # Restore the backup if an error occurred
-        if os.path.exists(backup_file):
-            shutil.copy2(backup_file, "sine_editor.py")
-            print("Restored original file from backup")
+        print("The original file was left unchanged")
         return False
 
 def main():
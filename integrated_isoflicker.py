@@ -43,6 +43,7 @@ from advanced_isochronic_generator import (
 
 # Import our refactored video processor
 from core.enhanced_video_processor import EnhancedVideoProcessor
+from core.flicker_kernels import apply_gain
 
 from PyQt5.QtCore import QObject, pyqtSignal, Qt, QThread
 from PyQt5.QtWidgets import (
@@ -272,6 +273,18 @@ class EnhancedFlickerWorker(FlickerWorker):
                 if preset_for_overlays is not None and hasattr(preset_for_overlays, 'text_overlays'):
                     text_overlays = preset_for_overlays.text_overlays or []
 
+                # Sample the preset's frequency timeline once for every frame time
+                preset = self.config.get("preset")
+                if preset and hasattr(preset, 'entrainment_curve'):
+                    curve = preset.entrainment_curve
+                    frame_times = np.arange(frame_count) / fps
+                    if hasattr(curve, 'get_values_at_times'):
+                        frame_freqs = curve.get_values_at_times(frame_times)
+                    else:
+                        frame_freqs = [curve.get_value_at_time(t) for t in frame_times]
+                else:
+                    frame_freqs = None
+
                 for i in range(frame_count):
                     if i % 10 == 0:  # Update progress every 10 frames
                         progress = 20 + int((i / frame_count) * 60)
@@ -281,9 +294,8 @@ class EnhancedFlickerWorker(FlickerWorker):
                     frame = video_clip.get_frame(t)
                     
                     # Get current frequency from preset timeline if available
-                    preset = self.config.get("preset")
-                    if preset and hasattr(preset, 'entrainment_curve'):
-                        current_freq = preset.entrainment_curve.get_value_at_time(t)
+                    if frame_freqs is not None:
+                        current_freq = frame_freqs[i]
                     else:
                         current_freq = self.config["visual_frequency"]
                     
@@ -293,7 +305,7 @@ class EnhancedFlickerWorker(FlickerWorker):
                         flicker_amp = self.config.get("flicker_amplitude", 0.5)
                         factor = 1.0 + flicker_amp * math.sin(2.0 * math.pi * current_freq * t)
                         factor = max(0, min(2.0, factor))  # Limit range to avoid extreme values
-                        modified_frame = np.clip(frame.astype(np.float32) * factor, 0, 255).astype(np.uint8)
+                        modified_frame = apply_gain(frame, factor)
                         
                     elif visual_type == "color_cycle" or visual_type == "color cycle":
                         # Color cycling effect
@@ -317,7 +329,7 @@ class EnhancedFlickerWorker(FlickerWorker):
                         # On/off pulse effect based on square wave
                         pulse = 0.5 * (1 + np.sign(math.sin(2.0 * math.pi * current_freq * t)))
                         factor = 1.0 if pulse > 0.5 else max(0.5, 1.0 - self.config.get("flicker_amplitude", 0.5))
-                        modified_frame = np.clip(frame.astype(np.float32) * factor, 0, 255).astype(np.uint8)
+                        modified_frame = apply_gain(frame, factor)
                     
                     # Apply text overlays (if any) on the modified frame
                     if text_overlays:
@@ -470,6 +482,19 @@ class Curve:
         
         return self.default_value
     
+    def get_values_at_times(self, times):
+        """Get interpolated values for an array of times in one vectorized pass.
+
+        Equivalent to calling get_value_at_time for each entry: linear between
+        control points and held at the first/last value outside them.
+        """
+        times = np.asarray(times, dtype=np.float64)
+        if not self.control_points:
+            return np.full(times.shape, self.default_value, dtype=np.float64)
+        point_times = np.fromiter((p.time for p in self.control_points), dtype=np.float64)
+        point_values = np.fromiter((p.value for p in self.control_points), dtype=np.float64)
+        return np.interp(times, point_times, point_values)
+    
     def get_duration(self):
         """Get the duration of the curve (time of last point)"""
         if not self.control_points:
@@ -630,7 +655,7 @@ class SinePreset:
         
         # Generate time array
         num_samples = int(sample_rate * duration)
-        t = np.linspace(0, duration, num_samples, endpoint=False)
+        t = np.arange(num_samples) / sample_rate
         
         # Create output array
         output = np.zeros(num_samples)
@@ -640,24 +665,23 @@ class SinePreset:
         
         # Process in small chunks to handle varying parameters
         chunk_size = int(0.01 * sample_rate)  # 10ms chunks
-        for i in range(0, num_samples, chunk_size):
+        
+        # Evaluate every curve once on the uniform chunk-start grid
+        chunk_starts = t[::chunk_size]
+        entrainment_freqs = self.entrainment_curve.get_values_at_times(chunk_starts)
+        volumes = self.volume_curve.get_values_at_times(chunk_starts)
+        base_freqs = self.base_freq_curve.get_values_at_times(chunk_starts)
+        
+        for chunk_index, i in enumerate(range(0, num_samples, chunk_size)):
             end_idx = min(i + chunk_size, num_samples)
             chunk_t = t[i:end_idx]
             
-            # Get current time in seconds
-            current_time = chunk_t[0]
-            
-            # Look up parameters at this time
-            entrainment_freq = self.entrainment_curve.get_value_at_time(current_time)
-            volume = self.volume_curve.get_value_at_time(current_time)
-            base_freq = self.base_freq_curve.get_value_at_time(current_time)
-            
             # Generate chunk using advanced tone generator with modulation options
             chunk_output = tone_generator.generate_tone_segment(
                 duration=len(chunk_t)/sample_rate,
-                carrier_freq=base_freq,
-                entrainment_freq=entrainment_freq,
-                volume=volume,
+                carrier_freq=float(base_freqs[chunk_index]),
+                entrainment_freq=float(entrainment_freqs[chunk_index]),
+                volume=float(volumes[chunk_index]),
                 sample_rate=sample_rate,
                 carrier_type=self.carrier_type,
                 modulation_type=self.modulation_type
@@ -719,6 +743,30 @@ class SinePreset:
         
         return looped_audio, sr
     
+    def iter_looped_audio(self, target_duration, sample_rate=44100, chunk_duration=1.0):
+        """Yield the audio of generate_looped_audio in chunks of about chunk_duration seconds.
+
+        Only one pass of the base audio is held in memory, so writing a long
+        looped track does not allocate the whole track at once.
+        """
+        audio_data, sr = self.generate_audio(sample_rate)
+        loop_samples = len(audio_data)
+        if loop_samples == 0:
+            return
+
+        # Loop up to the target duration, or play the base audio once if it is longer
+        total_samples = loop_samples
+        if loop_samples / sr < target_duration:
+            total_samples = int(target_duration * sr)
+
+        chunk_samples = max(1, int(chunk_duration * sr))
+        position = 0
+        while position < total_samples:
+            offset = position % loop_samples
+            count = min(chunk_samples, total_samples - position, loop_samples - offset)
+            yield audio_data[offset:offset + count]
+            position += count
+    
     def save_to_file(self, filepath):
         """Save preset to a .sin file"""
         data = {
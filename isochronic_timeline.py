@@ -15,6 +15,40 @@ from PyQt5.QtGui import QPainter, QColor, QBrush, QPen, QFont, QLinearGradient
 # Import the advanced generator
 from advanced_isochronic_generator import IsochronicPresetGenerator, IsochronicToneGenerator, WaveformType, ModulationType
 
+def downmix_to_mono(data):
+    """Average the channels of a (frames, channels) array into a mono buffer.
+
+    Stereo input is summed into a single preallocated buffer and scaled in
+    place, so only one frame-sized array is written. Mono input is returned
+    unchanged.
+    """
+    if data.ndim < 2 or data.shape[1] < 2:
+        return data
+    if data.shape[1] == 2:
+        mono = np.empty(data.shape[0], dtype=data.dtype)
+        np.add(data[:, 0], data[:, 1], out=mono)
+        mono *= 0.5
+        return mono
+    return np.einsum("ij->i", data) * (1.0 / data.shape[1])
+
+
+def load_background_audio(path, duration=None):
+    """Load a background track as mono, reading only the frames that are needed.
+
+    Args:
+        path (str): Path to the background audio file
+        duration (float, optional): Seconds of audio required. When omitted the
+            whole file is read.
+
+    Returns:
+        tuple: (mono audio data as float32, sample rate)
+    """
+    with sf.SoundFile(path) as bf:
+        frames = -1 if duration is None else int(duration * bf.samplerate)
+        data = bf.read(frames=frames, dtype="float32", always_2d=False)
+        return downmix_to_mono(data), bf.samplerate
+
+
 class TimelineSegment:
     """Represents a single segment in the isochronic timeline"""
     def __init__(self, 
@@ -75,6 +109,8 @@ class IsochronicPreset:
     
     def get_total_duration(self):
         """Calculate total duration of all segments"""
+        # Summed on every call: segments are edited in place by the editor
+        # widgets, so a cached total could go stale
         return sum(segment.duration for segment in self.segments)
     
     def to_dict(self):
@@ -751,10 +787,9 @@ class IsochronicEditorWidget(QWidget):
             background_data = None
             if self.background_audio_path and os.path.exists(self.background_audio_path):
                 try:
-                    background_data, background_sr = sf.read(self.background_audio_path)
-                    # Convert to mono if stereo
-                    if len(background_data.shape) > 1 and background_data.shape[1] > 1:
-                        background_data = np.mean(background_data, axis=1)
+                    background_data, background_sr = load_background_audio(
+                        self.background_audio_path, self.preset.get_total_duration()
+                    )
                 except Exception as e:
                     print(f"Warning: Failed to load background audio: {e}")
             
@@ -786,10 +821,9 @@ class IsochronicEditorWidget(QWidget):
         background_data = None
         if self.background_audio_path and os.path.exists(self.background_audio_path):
             try:
-                background_data, background_sr = sf.read(self.background_audio_path)
-                # Convert to mono if stereo
-                if len(background_data.shape) > 1 and background_data.shape[1] > 1:
-                    background_data = np.mean(background_data, axis=1)
+                background_data, background_sr = load_background_audio(
+                    self.background_audio_path, self.preset.get_total_duration()
+                )
             except Exception as e:
                 print(f"Warning: Failed to load background audio: {e}")
         
@@ -2,6 +2,12 @@ import xml.etree.ElementTree as ET
 import json
 import os
 
+# XML presets above this size are validated with a streaming parse
+LARGE_PRESET_BYTES = 100 * 1024 * 1024
+_SNIFF_CHUNK = 64
+_UTF8_BOM = b'\xef\xbb\xbf'
+
+
 def xml_to_sine_preset(xml_path):
     """
     Convert an XML preset file to a SINE preset format
@@ -165,7 +171,8 @@ def sine_preset_to_xml(preset_data, output_path):
         
         # Write to file
         tree = ET.ElementTree(root)
-        tree.write(output_path, encoding="utf-8", xml_declaration=True)
+        with open(output_path, "wb") as f:
+            tree.write(f, encoding="utf-8", xml_declaration=True)
         
         return True
     
@@ -247,12 +254,40 @@ def validate_preset_file(file_path):
     ext = os.path.splitext(file_path)[1].lower()
 
     if ext == '.sin':
+        if _sniff_first_byte(file_path) != b'{':
+            return False, 'sin'
         return _validate_sin(file_path), 'sin'
     if ext == '.xml':
+        if _sniff_first_byte(file_path) != b'<':
+            return False, 'xml'
+        if os.path.getsize(file_path) > LARGE_PRESET_BYTES:
+            return _validate_xml_streaming(file_path), 'xml'
         return _validate_xml(file_path), 'xml'
     return False, None
 
 
+def _sniff_first_byte(file_path):
+    """Return the first non-whitespace byte of a file, or b'' if there is none.
+
+    A leading UTF-8 byte order mark is skipped so BOM-prefixed XML still
+    sniffs as '<'.
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            head = f.read(len(_UTF8_BOM))
+            if head != _UTF8_BOM:
+                f.seek(0)
+            while True:
+                chunk = f.read(_SNIFF_CHUNK)
+                if not chunk:
+                    return b''
+                stripped = chunk.lstrip()
+                if stripped:
+                    return stripped[:1]
+    except OSError:
+        return b''
+
+
 def _validate_sin(file_path):
     """Validate .sin file format used by this app.
 
@@ -296,3 +331,45 @@ def _validate_xml(file_path):
         return False
     except Exception:
         return False
+
+
+def _validate_xml_streaming(file_path):
+    """Validate an XML preset with iterparse, stopping as soon as the answer is known.
+
+    Applies the same rules as _validate_xml without building the whole tree,
+    so very large files are rejected at the root tag or accepted at the first
+    entrainmentFrequency envelope.
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            depth = 0
+            root_tag = None
+            track_depth = None
+            seen = set()
+            for event, elem in ET.iterparse(f, events=('start', 'end')):
+                if event == 'start':
+                    depth += 1
+                    if depth == 1:
+                        root_tag = elem.tag
+                        if root_tag not in ('Preset', 'isochronic_preset'):
+                            return False
+                    elif root_tag == 'Preset':
+                        if track_depth is None and elem.tag == 'EntrainmentTrack':
+                            track_depth = depth
+                        elif (track_depth is not None and depth == track_depth + 1
+                                and elem.tag == 'Envelope'
+                                and elem.get('name') == 'entrainmentFrequency'):
+                            return True
+                    elif depth == 2:
+                        seen.add(elem.tag)
+                        if seen.issuperset(('frequency', 'carrier', 'volume')):
+                            return True
+                else:
+                    if depth == track_depth:
+                        # Only the first EntrainmentTrack is considered
+                        return False
+                    depth -= 1
+                    elem.clear()
+        return False
+    except Exception:
+        return False
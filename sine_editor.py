@@ -309,7 +309,7 @@ class SinePreset:
         
         # Generate time array
         num_samples = int(sample_rate * duration)
-        t = np.linspace(0, duration, num_samples, endpoint=False)
+        t = np.arange(num_samples) / sample_rate
         
         # Create output array
         output = np.zeros(num_samples)
@@ -584,6 +584,54 @@ class TrackCurve:
 
 
 
+    def get_values_at_times(self, times):
+
+
+
+        """Get interpolated values for an array of times in one vectorized pass.
+
+
+
+        Equivalent to calling get_value_at_time for each entry: linear between
+
+
+
+        control points and held at the first/last value outside them.
+
+
+
+        """
+
+
+
+        times = np.asarray(times, dtype=np.float64)
+
+
+
+        if not self.control_points:
+
+
+
+            return np.full(times.shape, self.default_value, dtype=np.float64)
+
+
+
+        point_times = np.fromiter((p.time for p in self.control_points), dtype=np.float64)
+
+
+
+        point_values = np.fromiter((p.value for p in self.control_points), dtype=np.float64)
+
+
+
+        return np.interp(times, point_times, point_values)
+
+
+
+    
+
+
+
     def get_point_near(self, x, y, width, height, duration, tolerance=20):
 
 
@@ -2140,7 +2188,7 @@ class SinePreset:
         
         # Generate time array
         num_samples = int(sample_rate * duration)
-        t = np.linspace(0, duration, num_samples, endpoint=False)
+        t = np.arange(num_samples) / sample_rate
         
         # Create output array
         output = np.zeros(num_samples)
@@ -2249,6 +2297,30 @@ class SinePreset:
         
         return looped_audio, sr
     
+    def iter_looped_audio(self, target_duration, sample_rate=44100, chunk_duration=1.0):
+        """Yield the audio of generate_looped_audio in chunks of about chunk_duration seconds.
+
+        Only one pass of the base audio is held in memory, so writing a long
+        looped track does not allocate the whole track at once.
+        """
+        audio_data, sr = self.generate_audio(sample_rate)
+        loop_samples = len(audio_data)
+        if loop_samples == 0:
+            return
+
+        # Loop up to the target duration, or play the base audio once if it is longer
+        total_samples = loop_samples
+        if loop_samples / sr < target_duration:
+            total_samples = int(target_duration * sr)
+
+        chunk_samples = max(1, int(chunk_duration * sr))
+        position = 0
+        while position < total_samples:
+            offset = position % loop_samples
+            count = min(chunk_samples, total_samples - position, loop_samples - offset)
+            yield audio_data[offset:offset + count]
+            position += count
+    
     def save_to_file(self, filepath):
         """Save preset to a .sin file"""
         import json
@@ -6,12 +6,50 @@ with better error handling and debugging information.
 
 import os
 import sys
+import json
+import time
+import shutil
+import hashlib
 import traceback
-import importlib
+import importlib.util
 import subprocess
 from core.ffmpeg_utils import ensure_ffmpeg_available
 from PyQt5.QtWidgets import QApplication
 
+# Cached result of the ffmpeg presence check, keyed on PATH
+FFMPEG_CHECK_CACHE = os.path.join(os.path.expanduser("~"), ".isoflicker", "ffmpeg_ok")
+FFMPEG_CHECK_MAX_AGE = 7 * 24 * 60 * 60  # seconds
+
+# Import names for packages whose distribution name differs
+_IMPORT_NAMES = {"ffmpeg_python": "ffmpeg"}
+_REPORT_NAMES = {"ffmpeg_python": "ffmpeg-python"}
+
+# Modules that make moviepy usable when moviepy.editor is absent (moviepy 2.x)
+_MOVIEPY_EDITOR_FALLBACKS = (
+    "moviepy.video.io.VideoFileClip",
+    "moviepy.audio.io.AudioFileClip",
+    "moviepy.video.io.ImageSequenceClip",
+    "moviepy.audio.AudioClip",
+)
+
+
+def _module_available(name):
+    """Return True if a module can be found, without executing it.
+
+    Only the parent package of a dotted name is imported (which find_spec
+    requires); the module itself is never run.
+    """
+    parent = name.partition(".")[0]
+    if importlib.util.find_spec(parent) is None:
+        return False
+    if parent == name:
+        return True
+    try:
+        return importlib.util.find_spec(name) is not None
+    except ImportError:
+        return False
+
+
 def check_dependencies():
     """Check if all required dependencies are installed"""
     required_packages = [
@@ -22,45 +60,58 @@ def check_dependencies():
     
     missing = []
     for package in required_packages:
-        try:
-            if package == "ffmpeg_python":
-                try:
-                    import ffmpeg  # noqa: F401
-                    continue
-                except ImportError:
-                    missing.append("ffmpeg-python")
-                    continue
-
-            if package == "moviepy.editor":
-                # Try the editor import first; if it raises, attempt known submodule fallbacks
-                try:
-                    importlib.import_module("moviepy.editor")
-                except ImportError:
-                    try:
-                        # Fallback: import core classes directly; if this works, editor is effectively usable
-                        from moviepy.video.io.VideoFileClip import VideoFileClip  # noqa: F401
-                        from moviepy.audio.io.AudioFileClip import AudioFileClip  # noqa: F401
-                        from moviepy.video.io.ImageSequenceClip import ImageSequenceClip  # noqa: F401
-                        from moviepy.audio.AudioClip import CompositeAudioClip  # noqa: F401
-                    except Exception:
-                        missing.append("moviepy.editor")
-                continue
-
-            # Default path: import the package/module
-            importlib.import_module(package)
-        except ImportError:
-            missing.append(package)
+        if _module_available(_IMPORT_NAMES.get(package, package)):
+            continue
+        if package == "moviepy.editor" and all(
+            _module_available(name) for name in _MOVIEPY_EDITOR_FALLBACKS
+        ):
+            # Core classes are importable directly, so editor is effectively usable
+            continue
+        missing.append(_REPORT_NAMES.get(package, package))
     
     return missing
 
+def _ffmpeg_path_hash():
+    """Hash of the current PATH, used to invalidate the ffmpeg check cache"""
+    return hashlib.sha1(os.environ.get("PATH", "").encode()).hexdigest()
+
+def _ffmpeg_cache_valid(path_hash):
+    """Return True if a recent successful ffmpeg check was recorded for this PATH"""
+    try:
+        with open(FFMPEG_CHECK_CACHE, 'r') as f:
+            cached = json.load(f)
+        return (cached.get("path_hash") == path_hash
+                and time.time() - float(cached.get("checked_at", 0)) < FFMPEG_CHECK_MAX_AGE)
+    except (OSError, ValueError, TypeError, AttributeError):
+        return False
+
+def _store_ffmpeg_cache(path_hash):
+    """Record a successful ffmpeg check; failures to write are ignored"""
+    try:
+        os.makedirs(os.path.dirname(FFMPEG_CHECK_CACHE), exist_ok=True)
+        with open(FFMPEG_CHECK_CACHE, 'w') as f:
+            json.dump({"path_hash": path_hash, "checked_at": time.time()}, f)
+    except OSError:
+        pass
+
 def check_ffmpeg_installed():
-    """Check if ffmpeg is installed on the system"""
+    """Check if ffmpeg is installed on the system
+
+    A successful ``ffmpeg -version`` run is cached per PATH for a week so
+    warm launches skip the subprocess spawn.
+    """
+    if shutil.which("ffmpeg") is None:
+        return False
+    path_hash = _ffmpeg_path_hash()
+    if _ffmpeg_cache_valid(path_hash):
+        return True
     try:
         with open(os.devnull, 'w') as devnull:
             subprocess.check_call(['ffmpeg', '-version'], stdout=devnull, stderr=devnull)
-        return True
     except (subprocess.CalledProcessError, FileNotFoundError):
         return False
+    _store_ffmpeg_cache(path_hash)
+    return True
 
 def main():
     print("\n===== IsoFlicker Pro Launcher =====\n")
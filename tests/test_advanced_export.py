@@ -162,4 +162,34 @@ def test_preset_save_load():
                 os.unlink(filepath)
                 
     except Exception as e:
-        pytest.fail(f"Failed to test preset save/load: {e}")
\ No newline at end of file
+        pytest.fail(f"Failed to test preset save/load: {e}")
+
+def test_batch_export(tmp_path):
+    """Test exporting one video to several presets"""
+    import numpy as np
+    import imageio_ffmpeg
+    from export.advanced_export import AdvancedExportManager
+    
+    video_path = str(tmp_path / "clip.mkv")
+    writer = imageio_ffmpeg.write_frames(video_path, (32, 24), fps=10, codec="ffv1",
+                                         pix_fmt_out="bgr0", macro_block_size=1)
+    writer.send(None)
+    for value in range(0, 250, 25):
+        writer.send(np.full((24, 32, 3), value, dtype=np.uint8))
+    writer.close()
+    
+    export_manager = AdvancedExportManager()
+    outputs = export_manager.batch_export(video_path, ["YouTube", "Lossless Archive"], str(tmp_path / "out"))
+    
+    assert [os.path.basename(path) for path in outputs] == ["clip_YouTube.mp4", "clip_Lossless_Archive.mkv"]
+    assert all(os.path.getsize(path) > 0 for path in outputs)
+
+
+def test_batch_export_rejects_unknown_presets(tmp_path):
+    """Test that unknown preset names are reported before anything is encoded"""
+    from export.advanced_export import AdvancedExportManager
+    
+    export_manager = AdvancedExportManager()
+    with pytest.raises(ValueError, match="Nope, Missing"):
+        export_manager.batch_export("clip.mkv", ["YouTube", "Nope", "Missing"], str(tmp_path / "out"))
+    assert not (tmp_path / "out").exists()
@@ -110,4 +110,122 @@ def test_isochronic_tone_generator_tone_segment():
     assert len(tone_segment) == expected_samples
     
     # Check that the data is in the right range
-    assert np.max(np.abs(tone_segment)) <= volume
\ No newline at end of file
+    assert np.max(np.abs(tone_segment)) <= volume
+
+def test_isochronic_tone_generator_gaussian_modulation():
+    """Test that gaussian modulation peaks once per period at the period centre"""
+    generator = IsochronicToneGenerator(sample_rate=1000)
+    
+    modulation = generator.generate_modulation(ModulationType.GAUSSIAN, 10.0, 1.0, duty_cycle=0.5)
+    
+    assert len(modulation) == 1000
+    assert np.min(modulation) >= 0.0
+    assert np.max(modulation) <= 1.0
+    
+    # 100-sample periods with the peak at offset 50
+    periods = modulation.reshape(10, 100)
+    assert np.all(np.argmax(periods, axis=1) == 50)
+    assert np.allclose(periods, periods[0])
+
+
+def test_isochronic_tone_generator_trapezoid_modulation():
+    """Test trapezoid modulation ramps, holds and returns to zero each period"""
+    generator = IsochronicToneGenerator(sample_rate=1000)
+    
+    modulation = generator.generate_modulation(
+        ModulationType.TRAPEZOID, 10.0, 1.0, ramp_percent=10
+    )
+    
+    assert len(modulation) == 1000
+    periods = modulation.reshape(10, 100)
+    assert np.allclose(periods, periods[0])
+    
+    # 10-sample ramps either side of a flat top
+    period = periods[0]
+    assert period[0] == 0.0
+    assert period[-1] == 0.0
+    assert np.all(np.diff(period[:11]) > 0)
+    assert np.all(period[10:90] == 1.0)
+    assert np.all(np.diff(period[89:]) < 0)
+
+
+def test_only_short_time_axes_are_cached():
+    """Test that axes up to one second are shared and longer ones are rebuilt per call"""
+    from advanced_isochronic_generator import _time_axis
+    
+    short = _time_axis(1000, 1000)
+    assert short is _time_axis(1000, 1000)
+    assert not short.flags.writeable
+    
+    long_axis = _time_axis(1000, 1001)
+    assert long_axis is not _time_axis(1000, 1001)
+    assert long_axis[-1] == 1.0
+
+
+def test_envelope_combine_matches_serial_on_the_shared_pool(monkeypatch):
+    """Test that long buffers combined on the shared pool equal the serial product"""
+    import advanced_isochronic_generator as generator_module
+    
+    rng = np.random.default_rng(0)
+    carrier = rng.random(300000, dtype=np.float32)
+    modulation = rng.random(300000, dtype=np.float32)
+    expected = generator_module._apply_envelope(carrier, modulation, 0.4)
+    
+    monkeypatch.setattr(generator_module, "_PARALLEL_COMBINE_MIN", 1)
+    assert np.array_equal(generator_module._apply_envelope(carrier, modulation, 0.4), expected)
+
+
+def test_preset_generator_writes_segments_into_one_buffer():
+    """Test that preset segments are rendered back to back into a float32 buffer"""
+    from types import SimpleNamespace
+    from advanced_isochronic_generator import IsochronicPresetGenerator
+    
+    segments = [
+        SimpleNamespace(start_freq=10.0, end_freq=10.0, base_freq=200.0,
+                        duration=0.5, volume=0.5, transition_type="linear"),
+        SimpleNamespace(start_freq=10.0, end_freq=4.0, base_freq=150.0,
+                        duration=0.5, volume=0.25, transition_type="exponential"),
+    ]
+    preset = SimpleNamespace(
+        segments=segments,
+        carrier_type=WaveformType.SINE,
+        modulation_type=ModulationType.SQUARE,
+        get_total_duration=lambda: sum(s.duration for s in segments),
+    )
+    
+    audio_data, sr = IsochronicPresetGenerator(sample_rate=8000).generate_from_preset(preset)
+    
+    assert sr == 8000
+    assert audio_data.dtype == np.float32
+    assert len(audio_data) == 8000
+    assert 0.4 < np.max(np.abs(audio_data[:4000])) <= 0.5
+    assert 0.2 < np.max(np.abs(audio_data[4000:])) <= 0.25
+
+
+def test_preset_generator_streamed_export_matches_buffer(tmp_path):
+    """Test that streaming export writes the same audio as the in-memory render"""
+    from types import SimpleNamespace
+    import soundfile as sf
+    from advanced_isochronic_generator import IsochronicPresetGenerator
+    
+    segments = [
+        SimpleNamespace(start_freq=8.0, end_freq=8.0, base_freq=220.0,
+                        duration=0.25, volume=0.5, transition_type="linear"),
+        SimpleNamespace(start_freq=8.0, end_freq=12.0, base_freq=220.0,
+                        duration=0.25, volume=0.5, transition_type="linear"),
+    ]
+    preset = SimpleNamespace(
+        segments=segments,
+        carrier_type=WaveformType.TRIANGLE,
+        modulation_type=ModulationType.SINE,
+        get_total_duration=lambda: 0.6,
+    )
+    generator = IsochronicPresetGenerator(sample_rate=8000)
+    
+    output_file = generator.export_to_file(preset, str(tmp_path / "preset.wav"), "wav")
+    written, sr = sf.read(output_file, dtype="float32")
+    expected, _ = generator.generate_from_preset(preset)
+    
+    assert sr == 8000
+    assert len(written) == len(expected) == 4800
+    assert np.allclose(written, expected, atol=1.0 / 32768)
@@ -107,4 +107,44 @@ def test_tone_generator_cache_clear():
     generator._cache.clear()
     
     # Check that the cache is empty
-    assert len(generator._cache) == 0
\ No newline at end of file
+    assert len(generator._cache) == 0
+
+def test_tone_generator_cache_is_bounded():
+    """Test that the cache evicts the least recently used segment when full"""
+    generator = IsochronicToneGenerator(sample_rate=1000)
+    generator.CACHE_SIZE = 3
+    
+    def generate(entrainment_freq):
+        return generator.generate_tone_segment(
+            duration=0.1,
+            carrier_freq=100.0,
+            entrainment_freq=entrainment_freq,
+            sample_rate=1000
+        )
+    
+    first = generate(1.0)
+    generate(2.0)
+    generate(3.0)
+    
+    # Touch the first entry so the second becomes least recently used
+    assert generate(1.0) is first
+    generate(4.0)
+    
+    assert len(generator._cache) == 3
+    cached_freqs = {key[2] for key in generator._cache}
+    assert cached_freqs == {1.0, 3.0, 4.0}
+
+
+def test_tone_generator_reuses_carrier_across_volumes():
+    """Test that a volume change reuses the cached carrier and modulation"""
+    generator = IsochronicToneGenerator(sample_rate=44100)
+    
+    quiet = generator.generate_tone_segment(duration=0.5, carrier_freq=100.0,
+                                            entrainment_freq=10.0, volume=0.25)
+    loud = generator.generate_tone_segment(duration=0.5, carrier_freq=100.0,
+                                           entrainment_freq=10.0, volume=0.5)
+    
+    assert len(generator._cache) == 2
+    assert len(generator._carrier_cache) == 1
+    assert len(generator._modulation_cache) == 1
+    assert np.allclose(loud, 2 * quiet)
@@ -0,0 +1,72 @@
+from types import SimpleNamespace
+
+import numpy as np
+import soundfile as sf
+
+from core.enhanced_video_processor import EnhancedVideoProcessor
+
+
+def _overlay(**kwargs):
+    params = dict(text="Hello", start_time=0.0, duration=2.0, opacity=0.5,
+                  font_size=24, position="center", color=(255, 255, 255))
+    params.update(kwargs)
+    return SimpleNamespace(**params)
+
+
+def test_text_overlay_only_touches_text_region():
+    """Blending is confined to the text box; the rest of the frame is untouched."""
+    frame = np.full((120, 160, 3), 40, dtype=np.uint8)
+    overlays = EnhancedVideoProcessor._prep_overlays([_overlay(position="top")], 160, 120)
+    result = EnhancedVideoProcessor._apply_text_overlays(None, frame, 1.0, overlays)
+
+    assert result is not frame
+    assert np.all(frame == 40)
+    changed_rows = np.flatnonzero((result != frame).any(axis=(1, 2)))
+    assert changed_rows.size and changed_rows.max() < 60
+
+
+def test_text_overlay_returns_frame_when_inactive():
+    """Frames outside every overlay's time window are returned as-is."""
+    frame = np.zeros((32, 32, 3), dtype=np.uint8)
+    overlays = EnhancedVideoProcessor._prep_overlays([_overlay()], 32, 32)
+    result = EnhancedVideoProcessor._apply_text_overlays(None, frame, 5.0, overlays)
+    assert result is frame
+
+
+def test_prep_overlays_resolves_qt_colors_and_skips_empty_durations():
+    """Qt-style colours become RGB tuples; zero-length overlays are dropped."""
+    qt_color = SimpleNamespace(red=lambda: 10, green=lambda: 20, blue=lambda: 30)
+    overlays = [_overlay(color=qt_color, start_time=1.0), _overlay(duration=0.0)]
+
+    prepared = EnhancedVideoProcessor._prep_overlays(overlays, 160, 120)
+
+    assert len(prepared) == 1
+    start, end, text, _, _, color, _, opacity, _ = prepared[0]
+    assert (start, end, text, color, opacity) == (1.0, 3.0, "Hello", (10, 20, 30), 0.5)
+
+
+class _ArrayAudio:
+    """Minimal audio clip backed by an array, sampled like MoviePy's to_soundarray."""
+
+    def __init__(self, samples, fps=44100):
+        self.samples = samples.reshape(len(samples), -1)
+        self.fps = fps
+        self.nchannels = self.samples.shape[1]
+        self.duration = len(samples) / fps
+
+    def to_soundarray(self, tt, fps):
+        return self.samples[np.round(np.asarray(tt) * self.fps).astype(int)]
+
+
+def test_mix_audio_scales_sums_and_pads_the_tone(tmp_path):
+    """The premix is original * volume + tone * volume, with silence past the tone's end."""
+    original = _ArrayAudio(np.full((66150, 2), 0.4))
+    tone = _ArrayAudio(np.full(44100, 0.6))
+    mixed_path = tmp_path / "mixed.wav"
+
+    EnhancedVideoProcessor._mix_audio(original, tone, 0.5, 0.5, str(mixed_path))
+
+    mixed, sample_rate = sf.read(mixed_path)
+    assert sample_rate == 44100 and mixed.shape == (66150, 2)
+    np.testing.assert_allclose(mixed[:44100], 0.5, atol=1e-4)
+    np.testing.assert_allclose(mixed[44100:], 0.2, atol=1e-4)
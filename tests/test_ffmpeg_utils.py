@@ -0,0 +1,96 @@
+import os
+
+import imageio_ffmpeg
+import numpy as np
+import soundfile as sf
+
+from core import ffmpeg_utils
+
+
+def test_ensure_ffmpeg_available_caches_until_path_changes(tmp_path, monkeypatch):
+    """The probe finds ffmpeg on PATH without running it and re-probes on PATH changes."""
+    fake = tmp_path / "ffmpeg"
+    fake.write_text("#!/bin/sh\nexit 0\n")
+    fake.chmod(0o755)
+    monkeypatch.setattr(ffmpeg_utils, "_cached_result", None)
+    monkeypatch.delenv("FFMPEG_BINARY", raising=False)
+    monkeypatch.setenv("PATH", str(tmp_path))
+
+    assert ffmpeg_utils.ensure_ffmpeg_available()
+    fake.unlink()
+    assert ffmpeg_utils.ensure_ffmpeg_available()
+
+    monkeypatch.setenv("PATH", str(tmp_path) + os.pathsep + str(tmp_path / "missing"))
+    assert not ffmpeg_utils.ensure_ffmpeg_available()
+
+
+def test_mix_audio_scales_and_sums_over_the_video_duration(tmp_path):
+    """amix sums the scaled inputs without normalizing and runs for the given duration."""
+    original = tmp_path / "original.wav"
+    tone = tmp_path / "tone.wav"
+    mixed = tmp_path / "mixed.wav"
+    sf.write(original, np.full(44100, 0.4), 44100)
+    sf.write(tone, np.full(22050, 0.6), 44100)
+
+    ffmpeg_utils.mix_audio(str(original), str(tone), 0.5, 0.5, str(mixed), 1.0)
+
+    data, sample_rate = sf.read(mixed)
+    assert sample_rate == 44100 and len(data) == 44100
+    np.testing.assert_allclose(data[:22050], 0.5, atol=1e-3)
+    np.testing.assert_allclose(data[22050:], 0.2, atol=1e-3)
+
+
+def test_mix_audio_pads_a_short_original_track(tmp_path):
+    """A video audio track shorter than the video is padded rather than ending the mix."""
+    original = tmp_path / "original.wav"
+    tone = tmp_path / "tone.wav"
+    mixed = tmp_path / "mixed.wav"
+    sf.write(original, np.full(22050, 0.4), 44100)
+    sf.write(tone, np.full(44100, 0.6), 44100)
+
+    ffmpeg_utils.mix_audio(str(original), str(tone), 0.5, 0.5, str(mixed), 1.5)
+
+    data, _ = sf.read(mixed)
+    assert len(data) == 66150
+    np.testing.assert_allclose(data[:22050], 0.5, atol=1e-3)
+    np.testing.assert_allclose(data[22050:44100], 0.3, atol=1e-3)
+    np.testing.assert_allclose(data[44100:], 0.0, atol=1e-3)
+
+
+def test_probe_frame_count_prefers_the_reader_count():
+    """The probed count wins over duration * fps, which is only the fallback."""
+    from types import SimpleNamespace
+
+    clip = SimpleNamespace(reader=SimpleNamespace(n_frames=203), duration=8.0)
+    assert ffmpeg_utils.probe_frame_count(clip, 25) == 203
+    clip.reader = SimpleNamespace(nframes=204)
+    assert ffmpeg_utils.probe_frame_count(clip, 25) == 204
+    clip.reader = SimpleNamespace()
+    assert ffmpeg_utils.probe_frame_count(clip, 25) == 200
+
+
+def test_write_video_pads_short_audio_to_the_video_length(tmp_path):
+    """Audio shorter than the frames is padded; the picture is never cut."""
+    audio = tmp_path / "short.wav"
+    output = tmp_path / "out.mkv"
+    sf.write(audio, np.zeros(44100), 44100)
+    frames = (np.full((24, 32, 3), i, dtype=np.uint8) for i in range(50))
+
+    ffmpeg_utils.write_video(frames, str(output), (32, 24), 25, "ffv1",
+                             ffmpeg_utils.encoder_params("ffv1", {}), str(audio), "pcm_s16le",
+                             duration=50 / 25)
+
+    assert imageio_ffmpeg.count_frames_and_secs(str(output)) == (50, 2.0)
+
+
+def test_encoder_params_default_to_medium_quality_h264():
+    """h264 is lossy at the MEDIUM preset unless the config asks otherwise; ffv1 stays lossless."""
+    def crf(params):
+        return params[params.index("-crf") + 1]
+
+    assert crf(ffmpeg_utils.encoder_params("h264", {})) == "25"
+    assert crf(ffmpeg_utils.encoder_params("h264", {"quality": "lossless"})) == "0"
+    overridden = ffmpeg_utils.encoder_params("h264", {"crf": 18, "encoder_preset": "fast"})
+    assert crf(overridden) == "18"
+    assert overridden[overridden.index("-preset") + 1] == "fast"
+    assert crf(ffmpeg_utils.encoder_params("ffv1", {"quality": "low"})) == "0"
@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+from core import flicker_kernels
+from core.flicker_kernels import apply_gain, flicker_factors, gain_table, is_identity_gain, iter_scaled_frames
+
+
+@pytest.mark.parametrize("factor", [0.0, 0.35, 1.0, 1.37, 2.5, -0.4])
+def test_apply_gain_matches_float_scaling(factor):
+    """The LUT gain matches the float32 multiply/clip/truncate path."""
+    frame = np.random.default_rng(0).integers(0, 256, (24, 32, 3), dtype=np.uint8)
+    expected = np.clip(frame.astype(np.float32) * factor, 0, 255).astype(np.uint8)
+    assert np.array_equal(apply_gain(frame, factor), expected)
+
+
+def test_apply_gain_writes_into_out():
+    """A caller-provided buffer is filled and returned."""
+    frame = np.full((4, 4, 3), 100, dtype=np.uint8)
+    out = np.empty_like(frame)
+    assert apply_gain(frame, 1.5, out=out) is out
+    assert np.all(out == 150)
+
+
+def test_flicker_factors_effects():
+    """Pulse, fade and strobe factors follow the effect definitions."""
+    # Quarter periods of a 1 Hz wave: sin = 1, -1, 0
+    times = np.array([0.25, 0.75, 0.0])
+    np.testing.assert_allclose(flicker_factors("pulse", 0.5, 1.0, times), [1.5, 0.5, 1.0])
+    np.testing.assert_allclose(flicker_factors("pulse", 2.0, 1.0, times), [3.0, 0.0, 1.0])
+    np.testing.assert_allclose(flicker_factors("fade", 0.5, 1.0, times), [1.0, 1.0, 1.0])
+    np.testing.assert_allclose(flicker_factors("fade", -0.5, 1.0, times), [0.5, 1.0, 0.75])
+    np.testing.assert_allclose(flicker_factors("strobe", 0.3, 1.0, times), [1.3, 0.7, 1.0])
+
+
+def test_flicker_factors_accept_per_frame_frequencies():
+    """A frequency per frame is applied element-wise."""
+    times = np.array([0.25, 0.25])
+    np.testing.assert_allclose(flicker_factors("pulse", 0.5, np.array([1.0, 3.0]), times), [1.5, 0.5])
+
+
+def test_gain_tables_are_cached_per_float32_factor():
+    """Factors equal in float32 share one read-only table."""
+    table = gain_table(1.25)
+    assert gain_table(np.float32(1.25)) is table
+    assert not table.flags.writeable
+
+
+def test_is_identity_gain_follows_the_table():
+    """Only factors whose table maps every level to itself are identities."""
+    assert is_identity_gain(1.0)
+    assert is_identity_gain(1.002)  # 255 * 1.002 still truncates to 255
+    assert not is_identity_gain(0.999)
+    assert not is_identity_gain(1.004)
+
+
+def test_iter_scaled_frames_keeps_order_across_batches():
+    """Frames come back in input order, written into the recycled blocks."""
+    frames = [np.full((2, 3, 3), i, dtype=np.uint8) for i in range(50)]
+
+    def scale_batch(batch, block):
+        return [apply_gain(frame, 2.0, block[k]) for k, frame in enumerate(batch)]
+
+    scaled = [frame.copy() for frame in iter_scaled_frames(iter(frames), scale_batch, (2, 3, 3), batch_size=4)]
+
+    assert len(scaled) == 50
+    for i, frame in enumerate(scaled):
+        assert np.all(frame == 2 * i)
+
+
+def test_iter_scaled_frames_bounds_blocks_by_the_byte_budget(monkeypatch):
+    """A tight budget keeps just two blocks in flight whatever the core count."""
+    monkeypatch.setattr(flicker_kernels, "FRAME_BUFFER_BUDGET", 1)
+    monkeypatch.setattr(flicker_kernels.os, "cpu_count", lambda: 64)
+    blocks = set()
+
+    def scale_batch(batch, block):
+        blocks.add(id(block))
+        return [apply_gain(frame, 1.5, block[k]) for k, frame in enumerate(batch)]
+
+    frames = (np.full((2, 3, 3), 10, dtype=np.uint8) for _ in range(40))
+    assert all(np.all(frame == 15) for frame in iter_scaled_frames(frames, scale_batch, (2, 3, 3), batch_size=4))
+    assert len(blocks) == 2
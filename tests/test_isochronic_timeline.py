@@ -0,0 +1,53 @@
+import numpy as np
+import soundfile as sf
+from isochronic_timeline import (
+    IsochronicPreset, TimelineSegment, downmix_to_mono, load_background_audio
+)
+
+
+def test_downmix_to_mono_matches_channel_mean():
+    """Test that stereo and multichannel input average to the same mono signal"""
+    rng = np.random.default_rng(0)
+    for channels in (2, 5):
+        data = rng.random((1000, channels))
+        mono = downmix_to_mono(data)
+        assert mono.shape == (1000,)
+        assert np.allclose(mono, np.mean(data, axis=1))
+
+
+def test_downmix_to_mono_passes_mono_through():
+    """Test that mono input is returned unchanged"""
+    data = np.linspace(-1.0, 1.0, 100)
+    assert downmix_to_mono(data) is data
+
+
+def test_load_background_audio_reads_only_needed_frames(tmp_path):
+    """Test that only the requested duration is read from the background file"""
+    sample_rate = 8000
+    path = tmp_path / "background.wav"
+    stereo = np.random.default_rng(1).uniform(-0.5, 0.5, (sample_rate * 3, 2))
+    sf.write(path, stereo, sample_rate, subtype="FLOAT")
+
+    data, sr = load_background_audio(str(path), duration=1.0)
+
+    assert sr == sample_rate
+    assert data.dtype == np.float32
+    assert len(data) == sample_rate
+    assert np.allclose(data, stereo[:sample_rate].mean(axis=1), atol=1e-6)
+
+    full, _ = load_background_audio(str(path))
+    assert len(full) == len(stereo)
+
+
+def test_total_duration_follows_segment_edits():
+    """Total duration reflects segments edited in place, added or removed."""
+    preset = IsochronicPreset()
+    preset.add_segment(TimelineSegment(duration=30))
+    preset.add_segment(TimelineSegment(duration=15))
+    assert preset.get_total_duration() == 45
+
+    preset.segments[0].duration = 10
+    assert preset.get_total_duration() == 25
+
+    preset.remove_segment(1)
+    assert preset.get_total_duration() == 10
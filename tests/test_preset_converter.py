@@ -0,0 +1,63 @@
+import pytest
+import preset_converter
+from preset_converter import sine_preset_to_xml, validate_preset_file
+
+
+SAMPLE_PRESET = {
+    "name": "Test Preset",
+    "entrainment_points": [{"time": 0, "value": 10.0}, {"time": 60, "value": 4.0}],
+    "volume_points": [{"time": 0, "value": 0.5}],
+    "base_freq_points": [{"time": 0, "value": 100.0}],
+}
+
+SIMPLE_XML = (
+    "<isochronic_preset><frequency>10</frequency>"
+    "<carrier>100</carrier><volume>0.5</volume></isochronic_preset>"
+)
+
+
+@pytest.fixture(params=[False, True], ids=["tree", "streaming"])
+def validate(request, monkeypatch):
+    """Run validation through both the full-parse and streaming XML paths"""
+    if request.param:
+        monkeypatch.setattr(preset_converter, "LARGE_PRESET_BYTES", 0)
+    return validate_preset_file
+
+
+def test_validate_exported_xml(tmp_path, validate):
+    """Test that XML written by sine_preset_to_xml validates"""
+    path = tmp_path / "preset.xml"
+    assert sine_preset_to_xml(SAMPLE_PRESET, str(path))
+    assert validate(str(path)) == (True, "xml")
+
+
+def test_validate_simple_xml(tmp_path, validate):
+    """Test that the older simple XML format validates"""
+    path = tmp_path / "simple.xml"
+    path.write_text(SIMPLE_XML)
+    assert validate(str(path)) == (True, "xml")
+
+
+@pytest.mark.parametrize("content", [
+    "<Preset><EntrainmentTrack/></Preset>",
+    "<Other><EntrainmentTrack><Envelope name='entrainmentFrequency'/></EntrainmentTrack></Other>",
+    "<isochronic_preset><frequency>10</frequency></isochronic_preset>",
+    '{"not": "xml"}',
+    "",
+])
+def test_reject_invalid_xml(tmp_path, validate, content):
+    """Test that malformed or mismatched XML presets are rejected"""
+    path = tmp_path / "bad.xml"
+    path.write_text(content)
+    assert validate(str(path)) == (False, "xml")
+
+
+def test_validate_sin_sniffs_content(tmp_path):
+    """Test that .sin files must contain a JSON object"""
+    good = tmp_path / "good.sin"
+    good.write_text('  {"entrainment_points": [], "volume_points": [], "base_freq_points": []}')
+    bad = tmp_path / "bad.sin"
+    bad.write_text("<Preset/>")
+    assert validate_preset_file(str(good)) == (True, "sin")
+    assert validate_preset_file(str(bad)) == (False, "sin")
+    assert validate_preset_file(str(tmp_path / "preset.txt")) == (False, None)
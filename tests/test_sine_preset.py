@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+
+from sine_editor_with_xml import SinePreset
+
+
+@pytest.mark.parametrize("target_duration", [10.0, 400.0])
+def test_iter_looped_audio_matches_generate_looped_audio(target_duration):
+    """Chunked looping yields exactly the samples of the materialized loop"""
+    preset = SinePreset()
+    expected, _ = preset.generate_looped_audio(target_duration, sample_rate=1000)
+
+    chunks = list(preset.iter_looped_audio(target_duration, sample_rate=1000, chunk_duration=7.0))
+
+    assert max(len(chunk) for chunk in chunks) <= 7000
+    assert np.array_equal(np.concatenate(chunks), expected)
+
+
+def test_track_curve_values_at_times_match_pointwise_lookup():
+    """The vectorized curve lookup agrees with get_value_at_time everywhere"""
+    curve = SinePreset().entrainment_curve
+    curve.control_points = []
+    for time, value in [(0.0, 4.0), (10.0, 12.0), (25.0, 6.0)]:
+        curve.add_point(time, value)
+    times = np.linspace(-5.0, 30.0, 141)
+
+    expected = [curve.get_value_at_time(t) for t in times]
+    np.testing.assert_allclose(curve.get_values_at_times(times), expected)
@@ -48,4 +48,28 @@ def test_detect_isochronic_frequency_with_nonexistent_file():
     """Test that frequency detection handles missing files gracefully"""
     # Should return default frequency when file doesn't exist
     freq = detect_isochronic_frequency("/nonexistent/file.wav")
-    assert freq == 10.0  # Default frequency
\ No newline at end of file
+    assert freq == 10.0  # Default frequency
+
+def test_detect_isochronic_frequency_caches_unchanged_files(tmp_path, monkeypatch):
+    """Test that an unchanged file is beat-tracked once and a rewritten one again"""
+    import soundfile as sf
+    from core import video_processor
+
+    calls = []
+
+    def fake_beat_track(y, sr):
+        calls.append(len(y))
+        return 120.0, None
+
+    monkeypatch.setattr(video_processor.librosa.beat, "beat_track", fake_beat_track)
+    video_processor._detect_frequency_cached.cache_clear()
+    audio_path = tmp_path / "tone.wav"
+    sf.write(audio_path, np.zeros(2205), 22050)
+
+    assert detect_isochronic_frequency(str(audio_path)) == 2.0
+    assert detect_isochronic_frequency(str(audio_path)) == 2.0
+    assert len(calls) == 1
+
+    sf.write(audio_path, np.zeros(4410), 22050)
+    assert detect_isochronic_frequency(str(audio_path)) == 2.0
+    assert len(calls) == 2